@@ -0,0 +1,163 @@
+import argparse
+import json
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from statistics import mean
+
+import create_solution_assessment_ppt as generator
+
+
+DECK_STAGES = {
+    "build_participant_presentation": "participant.pptx",
+    "build_trainer_presentation": "trainer.pptx",
+}
+
+
+def stage_names() -> list:
+    return ["generate_images", *(f"visual:{key}" for key in generator.VISUALS), *DECK_STAGES]
+
+
+def peak_rss_bytes() -> int:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_stage_once(stage: str, output_dir: Path) -> int:
+    if stage == "generate_images":
+        files = generator.generate_images(use_cache=False)
+        return sum(path.stat().st_size for path in files.values())
+
+    if stage.startswith("visual:"):
+        key = stage.split(":", 1)[1]
+        path = generator.ASSETS_DIR / generator.VISUALS[key][0]
+        generator.render_visual(key, path)
+        return path.stat().st_size
+
+    images = {key: generator.ASSETS_DIR / filename for key, (filename, _) in generator.VISUALS.items()}
+    output_file = output_dir / DECK_STAGES[stage]
+    getattr(generator, stage)(images, output_file)
+    return output_file.stat().st_size
+
+
+def prepare_assets(output_dir: str) -> None:
+    generator.use_output_root(Path(output_dir))
+    generator.ASSETS_DIR.mkdir(exist_ok=True)
+    generator.generate_images()
+
+
+def measure_stage(stage: str, repeat: int, output_dir: str) -> dict:
+    output_dir = Path(output_dir)
+    generator.use_output_root(output_dir)
+    generator.ASSETS_DIR.mkdir(exist_ok=True)
+
+    wall, cpu = [], []
+    output_bytes = 0
+    for _ in range(repeat):
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        output_bytes = run_stage_once(stage, output_dir)
+        wall.append(time.perf_counter() - wall_start)
+        cpu.append(time.process_time() - cpu_start)
+
+    return {
+        "stage": stage,
+        "runs": repeat,
+        "wall_s": {"mean": mean(wall), "min": min(wall), "max": max(wall)},
+        "cpu_s": {"mean": mean(cpu), "min": min(cpu), "max": max(cpu)},
+        "peak_rss_bytes": peak_rss_bytes(),
+        "output_bytes": output_bytes,
+    }
+
+
+def run_benchmarks(stages: list, repeat: int) -> list:
+    results = []
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory(prefix="deck-bench-") as output_dir:
+        for stage in stages:
+            # A fresh interpreter per stage keeps peak RSS and font/image caches
+            # from leaking between measurements. Deck stages get their visuals
+            # from a process of their own, so the render pass is not in their
+            # peak RSS; the render cache makes it a no-op once they exist.
+            if stage in DECK_STAGES:
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    pool.submit(prepare_assets, output_dir).result()
+            with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                results.append(pool.submit(measure_stage, stage, repeat, output_dir).result())
+    return results
+
+
+def compare_to_baseline(results: list, baseline: dict, tolerance: float) -> list:
+    previous = {entry["stage"]: entry for entry in baseline.get("results", [])}
+    regressions = []
+    for entry in results:
+        before = previous.get(entry["stage"])
+        if not before:
+            continue
+        for metric, current, reference in (
+            ("wall_s", entry["wall_s"]["mean"], before["wall_s"]["mean"]),
+            ("cpu_s", entry["cpu_s"]["mean"], before["cpu_s"]["mean"]),
+            ("peak_rss_bytes", entry["peak_rss_bytes"], before["peak_rss_bytes"]),
+            ("output_bytes", entry["output_bytes"], before["output_bytes"]),
+        ):
+            if reference and current > reference * (1 + tolerance):
+                regressions.append((entry["stage"], metric, reference, current))
+    return regressions
+
+
+def print_results(results: list) -> None:
+    print(f"{'stage':<40} {'wall ms':>10} {'cpu ms':>10} {'peak MB':>10} {'output KB':>10}")
+    for entry in results:
+        print(
+            f"{entry['stage']:<40} "
+            f"{entry['wall_s']['mean'] * 1000:>10.1f} "
+            f"{entry['cpu_s']['mean'] * 1000:>10.1f} "
+            f"{entry['peak_rss_bytes'] / 2**20:>10.1f} "
+            f"{entry['output_bytes'] / 1024:>10.1f}"
+        )
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark image rendering and deck assembly.")
+    parser.add_argument("--repeat", "-n", type=int, default=3, metavar="N", help="runs per stage (default: 3)")
+    parser.add_argument(
+        "--stage",
+        action="append",
+        choices=stage_names(),
+        metavar="STAGE",
+        help="benchmark only this stage (repeatable); default: every stage",
+    )
+    parser.add_argument("--json", type=Path, metavar="PATH", help="write results as JSON to PATH")
+    parser.add_argument("--baseline", type=Path, metavar="PATH", help="compare against a previous --json file")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.10,
+        help="allowed slowdown/growth over the baseline before failing (default: 0.10)",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    results = run_benchmarks(args.stage or stage_names(), args.repeat)
+    print_results(results)
+
+    if args.json:
+        args.json.write_text(json.dumps({"repeat": args.repeat, "results": results}, indent=2) + "\n", encoding="utf-8")
+
+    if args.baseline:
+        regressions = compare_to_baseline(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        for stage, metric, reference, current in regressions:
+            print(f"REGRESSION {stage} {metric}: {reference:.4g} -> {current:.4g}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
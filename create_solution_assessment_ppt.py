@@ -1,25 +1,113 @@
-from datetime import datetime
-from math import atan2, cos, sin
+from __future__ import annotations
+
+import __future__
+import argparse
+import ast
+import csv
+import hashlib
+import html
+import inspect
+import io
+import json
+import linecache
+import os
+import posixpath
+import re
+import sys
+import threading
+import time
+import traceback
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from math import atan2, ceil, cos, floor, sin
 from pathlib import Path
-from shutil import copyfile
+from shutil import copyfile, copyfileobj
+from stat import S_ISSOCK
 from textwrap import fill
+from typing import TYPE_CHECKING
+from weakref import WeakKeyDictionary, WeakValueDictionary
 
-from PIL import Image, ImageDraw, ImageFont
-from pptx import Presentation
-from pptx.dml.color import RGBColor
-from pptx.enum.shapes import MSO_SHAPE
-from pptx.enum.text import PP_ALIGN
-from pptx.util import Inches, Pt
+if TYPE_CHECKING:
+    # Pillow, python-pptx and lxml dominate start-up time, so the functions
+    # that need them import them; `--help` and `--list` never do.
+    from PIL import Image, ImageDraw, ImageFont
+    from pptx.presentation import Presentation
 
 
 ROOT = Path(__file__).parent
 ASSETS_DIR = ROOT / "presentation_assets"
+VARIANT_ASSETS_DIR = ROOT / "presentation_assets.variants"
+VARIANT_ASSETS_LIMIT = 64
 LEGACY_OUTPUT_FILE = ROOT / "Solution_Assessment_Cursor_AI_Capabilities_Integration_Review.pptx"
 PARTICIPANT_OUTPUT_FILE = ROOT / "Solution_Assessment_Cursor_AI_Capabilities_Integration_Review_Participant.pptx"
 TRAINER_OUTPUT_FILE = ROOT / "Solution_Assessment_Cursor_AI_Capabilities_Integration_Review_Trainer_45min.pptx"
+DECK_SPEC_DIR = ROOT / "deck_specs"
+DECK_SPECS = {
+    "participant": DECK_SPEC_DIR / "participant.json",
+    "trainer": DECK_SPEC_DIR / "trainer.json",
+}
+CONTENT_FILE = DECK_SPEC_DIR / "content.json"
+TUTORIAL_TEMPLATE = DECK_SPEC_DIR / "tutorial.md"
+TUTORIAL_OUTPUT_FILE = ROOT / "CURSOR_MCP_TRAINING_TUTORIAL.md"
+BATCH_OUTPUT_DIR = ROOT / "team_decks"
+PREVIEW_DIR = ROOT / "presentation_previews"
+WATCH_INTERVAL = 0.5
+SERVE_QUEUE_TIMEOUT = 30
+SERVE_MAX_REQUEST_BYTES = 1 << 20
+VARIANT_FIELDS = ("slug", "mcp_servers", "video_links")
+PPTX_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+RENDER_CACHE_FILE = ROOT / "presentation_assets.cache.json"
+RENDER_CACHE_VERSION = 1
+TEXT_LAYOUT_CACHE_FILE = ROOT / "presentation_assets.layout.json"
+
+CT_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+CONSTANT_TYPES = (str, int, float, bool, tuple, list, dict, frozenset)
+PLACEHOLDER = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+COMPILED_DECK_SPECS_LIMIT = 8
+IMAGE_STORE_LIMIT = 64
+VECTOR_DRAWINGS_LIMIT = 64
+TEXT_FITS_LIMIT = 512
+LOADED_CONTENT = {}
+
+PNG_PROFILES = {
+    "lossless-default": {"save": {}},
+    "fast": {"save": {"compress_level": 1}},
+    "small": {"colors": 256, "save": {"optimize": True}},
+}
+RENDER_SETTINGS = {"png_profile": "lossless-default", "scale": 1.0, "backend": "raster"}
+TEXT_FIT_MODES = ("warn", "shrink", "off")
+TEXT_FIT = "warn"
+TEXT_FIT_MIN_SCALE = 0.7
+TEXT_FIT_FONTS = {
+    # Carlito and Liberation Sans are metric-compatible with the template's
+    # Calibri and with Arial; DejaVu Sans is wider, so it over-reports.
+    "sans": [
+        "/usr/share/fonts/truetype/crosextra/Carlito-Regular.ttf",
+        "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    ],
+    "mono": [
+        "/usr/share/fonts/truetype/dejavu/DejaVuSansMono.ttf",
+        "/usr/share/fonts/truetype/liberation/LiberationMono-Regular.ttf",
+    ],
+}
+VECTOR_SUFFIX = ".shapes.json"
+MEASURING_DRAW = None
+THUMBNAIL_DIR = None
+BUILD_EPOCH = None
+ZIP_EPOCH = 315532800
+THUMBNAIL_WIDTH = 320
+CONTACT_SHEET_COLUMNS = 4
 
 CANVAS_W = 2400
 CANVAS_H = 1350
+CANVAS_BACKGROUND = (244, 248, 255)
+LAYER_TEMPLATES_LIMIT = 32
+
+MCP_SERVERS = ("jira", "figma", "bitbucket")
 
 VIDEO_LINKS = [
     ("Cursor AI beginner tutorial", "https://www.youtube.com/results?search_query=Cursor+AI+beginner+tutorial"),
@@ -37,30 +125,432 @@ VIDEO_LINKS = [
 ]
 
 
+def use_output_root(root: Path) -> None:
+    # Everything a build writes (decks, visuals, caches, previews) sits under
+    # one root so it can be redirected as a whole; the deck specs stay put.
+    global ROOT, ASSETS_DIR, VARIANT_ASSETS_DIR, LEGACY_OUTPUT_FILE, PARTICIPANT_OUTPUT_FILE, TRAINER_OUTPUT_FILE
+    global TUTORIAL_OUTPUT_FILE, BATCH_OUTPUT_DIR, PREVIEW_DIR, RENDER_CACHE_FILE, TEXT_LAYOUT_CACHE_FILE
+    ROOT = root
+    ASSETS_DIR = root / ASSETS_DIR.name
+    VARIANT_ASSETS_DIR = root / VARIANT_ASSETS_DIR.name
+    LEGACY_OUTPUT_FILE = root / LEGACY_OUTPUT_FILE.name
+    PARTICIPANT_OUTPUT_FILE = root / PARTICIPANT_OUTPUT_FILE.name
+    TRAINER_OUTPUT_FILE = root / TRAINER_OUTPUT_FILE.name
+    TUTORIAL_OUTPUT_FILE = root / TUTORIAL_OUTPUT_FILE.name
+    BATCH_OUTPUT_DIR = root / BATCH_OUTPUT_DIR.name
+    PREVIEW_DIR = root / PREVIEW_DIR.name
+    RENDER_CACHE_FILE = root / RENDER_CACHE_FILE.name
+    TEXT_LAYOUT_CACHE_FILE = root / TEXT_LAYOUT_CACHE_FILE.name
+
+
+class Tracer:
+    def __init__(self) -> None:
+        self.enabled = False
+        self.events = []
+
+    @contextmanager
+    def span(self, name: str, category: str, **args):
+        if not self.enabled:
+            yield args
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield args
+        finally:
+            end = time.perf_counter_ns()
+            self.events.append(
+                {
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": start / 1000,
+                    "dur": (end - start) / 1000,
+                    "pid": os.getpid(),
+                    "tid": threading.get_ident(),
+                    "args": args,
+                }
+            )
+
+    def extend(self, events: list) -> None:
+        self.events.extend(events)
+
+    def write(self, path: Path, trace_format: str = "chrome") -> None:
+        events = sorted(self.events, key=lambda event: event["ts"])
+        if trace_format == "chrome":
+            path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, default=str), encoding="utf-8")
+            return
+        origin = events[0]["ts"] if events else 0
+        lines = []
+        for event in events:
+            details = " ".join(f"{key}={value}" for key, value in event["args"].items())
+            lines.append(
+                f"{(event['ts'] - origin) / 1000:10.2f}ms {event['dur'] / 1000:9.2f}ms "
+                f"pid={event['pid']} {event['cat']:<7} {event['name']} {details}".rstrip()
+            )
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+TRACER = Tracer()
+
+
+class LRUCache(OrderedDict):
+    # Module-level caches outlive a build in --watch and --serve, and their
+    # keys carry file mtimes, so each one keeps only its newest entries.
+    def __init__(self, maxsize: int) -> None:
+        super().__init__()
+        self.maxsize = maxsize
+        self._lock = threading.RLock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self:
+                return default
+            self.move_to_end(key)
+            return self[key]
+
+    def __setitem__(self, key, value) -> None:
+        with self._lock:
+            super().__setitem__(key, value)
+            self.move_to_end(key)
+            while len(self) > self.maxsize:
+                self.popitem(last=False)
+
+
+FONT_CANDIDATES = {
+    False: [
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+        "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+    ],
+    True: [
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+        "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf",
+    ],
+}
+
+
+class FontRegistry:
+    def __init__(self, maxsize: int | None = None) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._files = {}
+        self._fonts = OrderedDict()
+
+    def resolve(self, bold: bool = False) -> str | None:
+        if bold not in self._files:
+            self._files[bold] = next((c for c in FONT_CANDIDATES[bold] if Path(c).exists()), None)
+        return self._files[bold]
+
+    def get(self, size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
+        key = (size, bold)
+        font = self._fonts.get(key)
+        if font is not None:
+            self.hits += 1
+            self._fonts.move_to_end(key)
+            return font
+
+        from PIL import ImageFont
+
+        self.misses += 1
+        with TRACER.span("load_font", "font", size=size, bold=bold):
+            font_file = self.resolve(bold)
+            font = ImageFont.truetype(font_file, size) if font_file else ImageFont.load_default()
+        self._fonts[key] = font
+        if self.maxsize is not None and len(self._fonts) > self.maxsize:
+            self._fonts.popitem(last=False)
+        return font
+
+    def configure(self, maxsize: int | None) -> None:
+        self.maxsize = maxsize
+        while maxsize is not None and len(self._fonts) > maxsize:
+            self._fonts.popitem(last=False)
+
+    def counts(self) -> tuple[int, int]:
+        return self.hits, self.misses
+
+    def add_counts(self, hits: int, misses: int) -> None:
+        self.hits += hits
+        self.misses += misses
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "cached_fonts": len(self._fonts),
+            "maxsize": self.maxsize,
+            "files": {"bold" if bold else "regular": path for bold, path in self._files.items()},
+        }
+
+
+FONTS = FontRegistry()
+
+
+def resolve_font_file(bold: bool = False) -> str | None:
+    return FONTS.resolve(bold)
+
+
 def load_font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
-    candidates = [
-        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-        "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf" if bold else "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
-    ]
-    for candidate in candidates:
-        if Path(candidate).exists():
-            return ImageFont.truetype(candidate, size)
-    return ImageFont.load_default()
+    scale = RENDER_SETTINGS["scale"]
+    return FONTS.get(size if scale == 1 else max(1, round(size * scale)), bold)
 
 
-def save_image(image: Image.Image, path: Path) -> None:
-    image.save(path, format="PNG", dpi=(300, 300))
+def thumbnail_size(size: tuple) -> tuple:
+    width, height = size
+    return THUMBNAIL_WIDTH, max(1, round(height * THUMBNAIL_WIDTH / width))
+
 
+def save_thumbnail(image: Image.Image, path: Path) -> None:
+    from PIL import Image
 
-def draw_header(draw: ImageDraw.ImageDraw, title: str, width: int, accent=(26, 92, 168)) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    image.resize(thumbnail_size(image.size), Image.Resampling.LANCZOS, reducing_gap=2.0).save(path, format="PNG")
+
+
+def save_image(image: Image.Image, path: Path) -> None:
+    from PIL import Image
+
+    profile = PNG_PROFILES[RENDER_SETTINGS["png_profile"]]
+    with TRACER.span("save_image", "encode", file=path.name) as span:
+        if isinstance(image, VectorCanvas):
+            image.save(path)
+        else:
+            encoded = image
+            if profile.get("colors"):
+                # The visuals are flat fills plus anti-aliased text, so an adaptive
+                # palette keeps them visually unchanged at a fraction of the size.
+                encoded = image.quantize(colors=profile["colors"], method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE)
+            encoded.save(path, format="PNG", dpi=(300, 300), **profile["save"])
+            # Written after the asset, so refresh_thumbnails() sees it as current.
+            if THUMBNAIL_DIR is not None:
+                save_thumbnail(image, THUMBNAIL_DIR / path.name)
+        if TRACER.enabled:
+            span["bytes"] = path.stat().st_size
+
+
+def font_identity(font) -> str | None:
+    path = getattr(font, "path", None)
+    if not path:
+        return None
+    return f"{Path(path).name}:{font.size}"
+
+
+class TextLayoutCache:
+    def __init__(self) -> None:
+        self.entries = {}
+        self.added = {}
+        self.dirty = False
+        self.hits = 0
+        self.misses = 0
+
+    def _lookup(self, key: tuple, compute):
+        value = self.entries.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+        self.misses += 1
+        value = self.entries[key] = self.added[key] = compute()
+        self.dirty = True
+        return value
+
+    def wrap(self, text: str, width: int) -> str:
+        return self._lookup(("wrap", text, "", width), lambda: fill(text, width=width))
+
+    def bbox(self, draw, text: str, font) -> tuple:
+        identity = font_identity(font)
+        if identity is None:
+            return draw.textbbox((0, 0), text, font=font)
+        key = ("bbox", text, identity, RENDER_SETTINGS["scale"])
+        return self._lookup(key, lambda: tuple(draw.textbbox((0, 0), text, font=font)))
+
+    def add_counts(self, hits: int, misses: int) -> None:
+        self.hits += hits
+        self.misses += misses
+
+    def pop_added(self) -> dict:
+        added, self.added = self.added, {}
+        return added
+
+    def merge(self, entries: dict) -> None:
+        if entries:
+            self.entries.update(entries)
+            self.dirty = True
+
+    def load(self, path: Path, validation: dict) -> None:
+        try:
+            stored = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if stored.get("validation") != validation:
+            return
+        for kind, text, identity, param, value in stored.get("entries", []):
+            self.entries.setdefault((kind, text, identity, param), tuple(value) if kind == "bbox" else value)
+
+    def save(self, path: Path, validation: dict) -> None:
+        if not self.dirty:
+            return
+        entries = sorted([*key, value] for key, value in self.entries.items())
+        path.write_text(json.dumps({"validation": validation, "entries": entries}) + "\n", encoding="utf-8")
+        self.dirty = False
+
+
+TEXT_LAYOUT = TextLayoutCache()
+
+
+def draw_header_banner(draw: ImageDraw.ImageDraw, width: int, accent) -> None:
     draw.rectangle((0, 0, width, 140), fill=accent)
+
+
+def draw_header(image: Image.Image | VectorCanvas, draw: ImageDraw.ImageDraw, title: str, width: int, accent=(26, 92, 168)) -> None:
+    stamp_layer(image, draw, "header", (width, tuple(accent)), (0, 0, width, 140), lambda layer: draw_header_banner(layer, width, accent))
     draw.text((48, 38), title, font=load_font(64, bold=True), fill=(255, 255, 255))
 
 
+class ScaledDraw:
+    # Visuals are laid out on the logical CANVAS_W x CANVAS_H grid; this maps
+    # every coordinate, radius and stroke width onto a smaller or larger bitmap.
+    def __init__(self, draw: ImageDraw.ImageDraw, scale: float) -> None:
+        self.draw = draw
+        self.scale = scale
+
+    def _xy(self, value):
+        if isinstance(value, (int, float)):
+            return value * self.scale
+        return type(value)(self._xy(item) for item in value)
+
+    def _width(self, width: int) -> int:
+        return max(1, round(width * self.scale))
+
+    def _spacing(self, text: str, options: dict) -> dict:
+        if "\n" in text:
+            options["spacing"] = options.get("spacing", 4) * self.scale
+        return options
+
+    def text(self, xy, text: str, **options) -> None:
+        self.draw.text(self._xy(xy), text, **self._spacing(text, options))
+
+    def textbbox(self, xy, text: str, **options):
+        bbox = self.draw.textbbox(self._xy(xy), text, **self._spacing(text, options))
+        return tuple(value / self.scale for value in bbox)
+
+    def rectangle(self, xy, fill=None, outline=None, width=1) -> None:
+        self.draw.rectangle(self._xy(xy), fill=fill, outline=outline, width=self._width(width))
+
+    def rounded_rectangle(self, xy, radius=0, fill=None, outline=None, width=1) -> None:
+        self.draw.rounded_rectangle(self._xy(xy), radius=radius * self.scale, fill=fill, outline=outline, width=self._width(width))
+
+    def ellipse(self, xy, fill=None, outline=None, width=1) -> None:
+        self.draw.ellipse(self._xy(xy), fill=fill, outline=outline, width=self._width(width))
+
+    def line(self, xy, fill=None, width=0) -> None:
+        self.draw.line(self._xy(xy), fill=fill, width=self._width(width) if width else 0)
+
+    def polygon(self, xy, fill=None, outline=None, width=1) -> None:
+        self.draw.polygon(self._xy(xy), fill=fill, outline=outline, width=self._width(width))
+
+
+class VectorCanvas:
+    # Records the same drawing calls the visuals make on an ImageDraw, in
+    # logical canvas units, so they can be replayed as native slide shapes.
+    def __init__(self, width: int, height: int, background) -> None:
+        self.size = (width, height)
+        self.background = background
+        self.ops = []
+
+    @staticmethod
+    def _points(xy) -> list:
+        flat = []
+        for item in xy:
+            if isinstance(item, (tuple, list)):
+                flat.extend(item)
+            else:
+                flat.append(item)
+        return [[flat[i], flat[i + 1]] for i in range(0, len(flat), 2)]
+
+    def _shape(self, op: str, xy, fill, outline, width, **extra) -> None:
+        (x1, y1), (x2, y2) = self._points(xy)
+        self.ops.append({"op": op, "box": [x1, y1, x2, y2], "fill": fill, "outline": outline, "width": width, **extra})
+
+    def text(self, xy, text: str, font=None, fill=None, **options) -> None:
+        bold = "Bold" in getattr(font, "path", "")
+        self.ops.append({"op": "text", "xy": list(xy), "text": text, "size": font.size, "bold": bold, "fill": fill})
+
+    def textbbox(self, xy, text: str, **options):
+        return measuring_draw().textbbox(xy, text, **options)
+
+    def rectangle(self, xy, fill=None, outline=None, width=1) -> None:
+        self._shape("rectangle", xy, fill, outline, width)
+
+    def rounded_rectangle(self, xy, radius=0, fill=None, outline=None, width=1) -> None:
+        self._shape("rounded_rectangle", xy, fill, outline, width, radius=radius)
+
+    def ellipse(self, xy, fill=None, outline=None, width=1) -> None:
+        self._shape("ellipse", xy, fill, outline, width)
+
+    def line(self, xy, fill=None, width=0) -> None:
+        self.ops.append({"op": "line", "points": self._points(xy), "fill": fill, "width": width})
+
+    def polygon(self, xy, fill=None, outline=None, width=1) -> None:
+        self.ops.append({"op": "polygon", "points": self._points(xy), "fill": fill, "outline": outline, "width": width})
+
+    def save(self, path: Path) -> None:
+        drawing = {"size": self.size, "background": self.background, "ops": self.ops}
+        path.write_text(json.dumps(drawing, separators=(",", ":")), encoding="utf-8")
+
+
+def measuring_draw() -> ImageDraw.ImageDraw:
+    global MEASURING_DRAW
+    if MEASURING_DRAW is None:
+        from PIL import Image, ImageDraw
+
+        MEASURING_DRAW = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+    return MEASURING_DRAW
+
+
+LAYER_TEMPLATES = LRUCache(LAYER_TEMPLATES_LIMIT)
+
+
+def stamp_layer(image: Image.Image | VectorCanvas, draw, name: str, key: tuple, box, render) -> None:
+    # Repeated chrome is drawn once onto a blank canvas and then pasted. The
+    # crop covers only background plus the layer, so it must be stamped
+    # before anything else is drawn inside `box`.
+    from PIL import Image, ImageDraw
+
+    if isinstance(image, VectorCanvas):
+        render(draw)
+        return
+
+    scale = RENDER_SETTINGS["scale"]
+    cache_key = (name, key, image.mode, image.size, scale)
+    layer = LAYER_TEMPLATES.get(cache_key)
+    if layer is None:
+        template = Image.new(image.mode, image.size, CANVAS_BACKGROUND)
+        template_draw = ImageDraw.Draw(template)
+        render(template_draw if scale == 1 else ScaledDraw(template_draw, scale))
+        x1, y1, x2, y2 = box
+        pixel_box = (
+            max(floor(x1 * scale), 0),
+            max(floor(y1 * scale), 0),
+            min(ceil(x2 * scale) + 1, image.width),
+            min(ceil(y2 * scale) + 1, image.height),
+        )
+        layer = LAYER_TEMPLATES[cache_key] = (template.crop(pixel_box), pixel_box[:2])
+    image.paste(*layer)
+
+
 def new_canvas(title: str, accent=(26, 92, 168)):
-    image = Image.new("RGB", (CANVAS_W, CANVAS_H), (244, 248, 255))
+    from PIL import Image, ImageDraw
+
+    if RENDER_SETTINGS["backend"] == "vector":
+        canvas = VectorCanvas(CANVAS_W, CANVAS_H, CANVAS_BACKGROUND)
+        draw_header(canvas, canvas, title, CANVAS_W, accent=accent)
+        return canvas, canvas
+
+    scale = RENDER_SETTINGS["scale"]
+    image = Image.new("RGB", (round(CANVAS_W * scale), round(CANVAS_H * scale)), CANVAS_BACKGROUND)
     draw = ImageDraw.Draw(image)
-    draw_header(draw, title, CANVAS_W, accent=accent)
+    if scale != 1:
+        draw = ScaledDraw(draw, scale)
+    draw_header(image, draw, title, CANVAS_W, accent=accent)
     return image, draw
 
 
@@ -83,7 +573,7 @@ def draw_arrow(draw: ImageDraw.ImageDraw, start, end, color=(70, 109, 175), widt
 
 def draw_text_center(draw: ImageDraw.ImageDraw, box, text: str, font, fill_color=(24, 45, 78)) -> None:
     x1, y1, x2, y2 = box
-    bb = draw.textbbox((0, 0), text, font=font)
+    bb = TEXT_LAYOUT.bbox(draw, text, font)
     text_w = bb[2] - bb[0]
     text_h = bb[3] - bb[1]
     draw.text((x1 + (x2 - x1 - text_w) / 2, y1 + (y2 - y1 - text_h) / 2), text, font=font, fill=fill_color)
@@ -95,7 +585,7 @@ def draw_card(draw: ImageDraw.ImageDraw, box, title: str, lines, fill_color=(236
     draw.text((x1 + 24, y1 + 20), title, font=load_font(44, bold=True), fill=(23, 45, 80))
     y = y1 + 88
     for line in lines:
-        wrapped = fill(line, width=29)
+        wrapped = TEXT_LAYOUT.wrap(line, 29)
         draw.text((x1 + 26, y), f"- {wrapped}", font=load_font(30), fill=(39, 58, 92))
         y += 62 + (wrapped.count("\n") * 18)
 
@@ -228,19 +718,25 @@ def create_architecture_visual(path: Path) -> None:
     save_image(image, path)
 
 
-def draw_fake_cursor_shell(draw: ImageDraw.ImageDraw, title: str) -> None:
+def draw_cursor_shell_frame(draw: ImageDraw.ImageDraw) -> None:
     draw.rounded_rectangle((220, 190, 2180, 1200), radius=24, fill=(23, 28, 38), outline=(75, 87, 112), width=4)
     draw.rectangle((220, 190, 2180, 260), fill=(34, 41, 57))
     draw.text((270, 210), "Cursor - Example UI", font=load_font(34, bold=True), fill=(226, 233, 247))
-    draw.text((790, 210), title, font=load_font(34), fill=(170, 184, 212))
 
     for i, c in enumerate([(250, 106, 106), (245, 183, 78), (93, 208, 105)]):
         draw.ellipse((236 + i * 30, 213, 256 + i * 30, 233), fill=c)
 
 
+def draw_fake_cursor_shell(image: Image.Image | VectorCanvas, draw: ImageDraw.ImageDraw, title: str) -> None:
+    # The title slot sits clear of the traffic-light dots, so drawing it after
+    # the stamped frame gives the same pixels as the original draw order.
+    stamp_layer(image, draw, "cursor_shell", (), (220, 190, 2180, 1200), draw_cursor_shell_frame)
+    draw.text((790, 210), title, font=load_font(34), fill=(170, 184, 212))
+
+
 def create_cursor_settings_screen(path: Path) -> None:
     image, draw = new_canvas("Screenshot: open MCP settings inside Cursor", accent=(40, 100, 158))
-    draw_fake_cursor_shell(draw, "Settings")
+    draw_fake_cursor_shell(image, draw, "Settings")
 
     draw.rectangle((260, 280, 620, 1160), fill=(29, 35, 48))
     menu_items = ["General", "Editor", "Terminal", "Features", "MCP", "Privacy", "About"]
@@ -272,9 +768,26 @@ def create_cursor_settings_screen(path: Path) -> None:
     save_image(image, path)
 
 
-def create_cursor_mcp_json_screen(path: Path) -> None:
+def mcp_json_lines(servers, compact: bool = False) -> list:
+    lines = ["{", '  "mcpServers": {']
+    for index, name in enumerate(servers):
+        if compact:
+            entry = f'    "{name}": {{"command":"python","args":["servers/{name}_server.py"],"envFile":".env"}}'
+            lines.append(entry + ("," if index < len(servers) - 1 else ""))
+            continue
+        lines += [
+            f'    "{name}": {{',
+            '      "command": "python",',
+            f'      "args": ["servers/{name}_server.py"],',
+            '      "envFile": ".env"',
+            "    }," if index < len(servers) - 1 else "    }",
+        ]
+    return lines + ["  }", "}"]
+
+
+def create_cursor_mcp_json_screen(path: Path, servers=MCP_SERVERS) -> None:
     image, draw = new_canvas("Screenshot: mcp.json setup", accent=(35, 119, 170))
-    draw_fake_cursor_shell(draw, "mcp.json")
+    draw_fake_cursor_shell(image, draw, "mcp.json")
 
     draw.rectangle((260, 280, 650, 1160), fill=(28, 36, 49))
     draw.text((300, 330), "Explorer", font=load_font(34, bold=True), fill=(220, 229, 246))
@@ -286,32 +799,14 @@ def create_cursor_mcp_json_screen(path: Path) -> None:
         y += 70
 
     draw.rectangle((680, 280, 2140, 1160), fill=(18, 24, 35))
-    json_lines = [
-        "{",
-        '  "mcpServers": {',
-        '    "jira": {',
-        '      "command": "python",',
-        '      "args": ["servers/jira_server.py"],',
-        '      "envFile": ".env"',
-        "    },",
-        '    "figma": {',
-        '      "command": "python",',
-        '      "args": ["servers/figma_server.py"],',
-        '      "envFile": ".env"',
-        "    },",
-        '    "bitbucket": {',
-        '      "command": "python",',
-        '      "args": ["servers/bitbucket_server.py"],',
-        '      "envFile": ".env"',
-        "    }",
-        "  }",
-        "}",
-    ]
+    json_lines = mcp_json_lines(servers)
+    # Three servers fill the editor; longer lists shrink to the same height.
+    fit = min(1.0, len(mcp_json_lines(MCP_SERVERS)) / len(json_lines))
     y = 330
     for idx, line in enumerate(json_lines, start=1):
-        draw.text((720, y), f"{idx:>2}", font=load_font(30), fill=(107, 122, 149))
-        draw.text((790, y), line, font=load_font(32), fill=(220, 231, 248))
-        y += 45
+        draw.text((720, y), f"{idx:>2}", font=load_font(round(30 * fit)), fill=(107, 122, 149))
+        draw.text((790, y), line, font=load_font(round(32 * fit)), fill=(220, 231, 248))
+        y += round(45 * fit)
 
     draw.rounded_rectangle((1760, 1040, 2060, 1130), radius=12, fill=(72, 126, 218))
     draw.text((1835, 1068), "Save", font=load_font(36, bold=True), fill=(255, 255, 255))
@@ -325,7 +820,7 @@ def create_cursor_mcp_json_screen(path: Path) -> None:
 
 def create_cursor_connection_status_screen(path: Path) -> None:
     image, draw = new_canvas("Screenshot: verify connections", accent=(24, 135, 96))
-    draw_fake_cursor_shell(draw, "MCP connection status")
+    draw_fake_cursor_shell(image, draw, "MCP connection status")
 
     draw.rectangle((260, 300, 2140, 1150), fill=(34, 44, 61))
     draw.text((320, 360), "MCP Server Status", font=load_font(46, bold=True), fill=(235, 241, 253))
@@ -373,7 +868,7 @@ def create_tutorial_path_visual(path: Path) -> None:
     for idx, step in enumerate(steps):
         box = (x, y, x + w, y + h)
         draw.rounded_rectangle(box, radius=18, fill=(237, 245, 255), outline=(126, 157, 208), width=3)
-        draw.text((x + 18, y + 55), fill(step, width=16), font=load_font(33, bold=True), fill=(27, 51, 91))
+        draw.text((x + 18, y + 55), TEXT_LAYOUT.wrap(step, 16), font=load_font(33, bold=True), fill=(27, 51, 91))
         if idx < len(steps) - 1:
             draw_arrow(draw, (x + w, y + h // 2), (x + w + gap - 6, y + h // 2))
         x += w + gap
@@ -597,7 +1092,7 @@ def create_five_min_routine_visual(path: Path) -> None:
         box = (x, y, x + w, y + h)
         draw.rounded_rectangle(box, radius=22, fill=(236, 247, 255), outline=(125, 157, 208), width=4)
         draw.text((x + 46, y + 56), minute, font=load_font(48, bold=True), fill=(28, 51, 93))
-        draw.text((x + 36, y + 178), fill(desc, width=16), font=load_font(36), fill=(41, 61, 95))
+        draw.text((x + 36, y + 178), TEXT_LAYOUT.wrap(desc, 16), font=load_font(36), fill=(41, 61, 95))
         if idx < len(steps) - 1:
             draw_arrow(draw, (x + w, y + h // 2), (x + w + gap - 16, y + h // 2), width=9)
         x += w + gap
@@ -608,45 +1103,335 @@ def create_five_min_routine_visual(path: Path) -> None:
     save_image(image, path)
 
 
-def generate_images() -> dict:
+VISUALS = {
+    "cover": ("cover_visual.png", create_cover_visual),
+    "top_mcp": ("top_mcp_tools.png", create_top_mcp_visual),
+    "top_skills": ("top_agent_skills.png", create_top_skills_visual),
+    "architecture": ("simple_architecture.png", create_architecture_visual),
+    "prompt_formula": ("prompt_formula.png", create_prompt_formula_visual),
+    "do_dont": ("do_dont.png", create_do_dont_visual),
+    "common_errors": ("common_errors_fixes.png", create_common_errors_visual),
+    "five_min_routine": ("five_min_routine.png", create_five_min_routine_visual),
+    "settings_screen": ("cursor_settings_screen.png", create_cursor_settings_screen),
+    "mcp_json_screen": ("cursor_mcp_json_screen.png", create_cursor_mcp_json_screen),
+    "status_screen": ("cursor_status_screen.png", create_cursor_connection_status_screen),
+    "tutorial_path": ("tutorial_path.png", create_tutorial_path_visual),
+    "daily_workflow": ("daily_workflow.png", create_daily_workflow_visual),
+    "risk_controls": ("risk_controls_simple.png", create_risk_controls_visual),
+    "roadmap": ("roadmap_30_60_90.png", create_roadmap_visual),
+}
+
+
+def visual_filename(filename: str) -> str:
+    if RENDER_SETTINGS["backend"] == "vector":
+        return Path(filename).stem + VECTOR_SUFFIX
+    return filename
+
+
+def render_visual(key: str, path: Path, options: dict | None = None) -> dict:
+    _, create = VISUALS[key]
+    font_hits, font_misses = FONTS.counts()
+    layout_hits, layout_misses = TEXT_LAYOUT.hits, TEXT_LAYOUT.misses
+    first_event = len(TRACER.events)
+    with TRACER.span(f"visual:{key}", "render"):
+        create(path, **(options or {}))
+    return {
+        "fonts": (FONTS.hits - font_hits, FONTS.misses - font_misses),
+        "layouts": (TEXT_LAYOUT.hits - layout_hits, TEXT_LAYOUT.misses - layout_misses),
+        "layout_entries": TEXT_LAYOUT.pop_added(),
+        "events": TRACER.events[first_event:],
+    }
+
+
+def init_render_worker(
+    font_cache_size: int | None,
+    tracing: bool = False,
+    settings: dict | None = None,
+    thumbnail_dir: Path | None = None,
+    build_epoch: int | None = None,
+    text_fit: str = "warn",
+) -> None:
+    global THUMBNAIL_DIR, BUILD_EPOCH, TEXT_FIT
+    FONTS.configure(font_cache_size)
+    TRACER.enabled = tracing
+    RENDER_SETTINGS.update(settings or {})
+    THUMBNAIL_DIR = thumbnail_dir
+    BUILD_EPOCH = build_epoch
+    TEXT_FIT = text_fit
+
+
+def render_scale(value: str) -> float:
+    scale = float(value)
+    if not 0 < scale <= 4:
+        raise argparse.ArgumentTypeError("render scale must be in (0, 4]")
+    return scale
+
+
+def font_cache_size(value: str) -> int:
+    size = int(value)
+    if size < 0:
+        raise argparse.ArgumentTypeError("font cache size must be >= 0")
+    return size
+
+
+def worker_count(value: str) -> int:
+    count = int(value)
+    if count < 0:
+        raise argparse.ArgumentTypeError("worker count must be >= 0 (0 = one per CPU)")
+    return count
+
+
+def positive_count(value: str) -> int:
+    count = int(value)
+    if count < 1:
+        raise argparse.ArgumentTypeError("value must be >= 1")
+    return count
+
+
+def resolve_jobs(jobs: int) -> int:
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+RENDER_HELPERS = (
+    load_font,
+    save_image,
+    draw_header_banner,
+    draw_header,
+    ScaledDraw,
+    stamp_layer,
+    VectorCanvas,
+    new_canvas,
+    draw_arrow,
+    TextLayoutCache,
+    draw_text_center,
+    draw_card,
+    draw_cursor_shell_frame,
+    draw_fake_cursor_shell,
+    mcp_json_lines,
+)
+
+
+def source_digest(*objects) -> str:
+    digest = hashlib.sha256()
+    for obj in objects:
+        digest.update(inspect.getsource(obj).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def referenced_constants(*objects) -> dict:
+    # Module constants (colours, sizes, server lists) the objects read, found
+    # through the global names their code uses, following the functions and
+    # classes of this module they call. Caches and paths are not data the
+    # pixels depend on, so only plain values count.
+    constants, seen = {}, set()
+    pending = list(objects)
+    while pending:
+        obj = pending.pop()
+        if obj in seen:
+            continue
+        seen.add(obj)
+        members = vars(obj).values() if inspect.isclass(obj) else [obj]
+        codes = [member.__code__ for member in members if inspect.isfunction(member)]
+        while codes:
+            code = codes.pop()
+            codes.extend(const for const in code.co_consts if inspect.iscode(const))
+            for name in code.co_names:
+                value = globals().get(name)
+                if inspect.isfunction(value) or inspect.isclass(value):
+                    if value.__module__ == __name__:
+                        pending.append(value)
+                elif name.isupper() and type(value) in CONSTANT_TYPES:
+                    constants[name] = repr(value)
+    return constants
+
+
+def file_digest(path: Path, algorithm: str = "sha256") -> str:
+    digest = hashlib.new(algorithm)
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def render_environment() -> dict:
+    import PIL
+
+    fonts = {}
+    for bold in (False, True):
+        font_file = resolve_font_file(bold)
+        if font_file:
+            stat = Path(font_file).stat()
+            fonts["bold" if bold else "regular"] = [font_file, stat.st_size, stat.st_mtime_ns]
+    return {
+        "canvas": [CANVAS_W, CANVAS_H],
+        "fonts": fonts,
+        "pillow": PIL.__version__,
+        "helpers": source_digest(*RENDER_HELPERS),
+        "settings": RENDER_SETTINGS,
+    }
+
+
+def visual_options_digest(options: dict) -> str:
+    return hashlib.sha256(json.dumps(options, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def visual_cache_keys(jobs: dict) -> dict:
+    environment = json.dumps(render_environment(), sort_keys=True)
+    keys = {}
+    for job_id, (key, path, options) in jobs.items():
+        _, create = VISUALS[key]
+        digest = hashlib.sha256(environment.encode("utf-8"))
+        digest.update(path.name.encode("utf-8"))
+        digest.update(source_digest(create).encode("utf-8"))
+        digest.update(json.dumps(referenced_constants(create), sort_keys=True).encode("utf-8"))
+        if options:
+            digest.update(visual_options_digest(options).encode("utf-8"))
+        keys[job_id] = digest.hexdigest()
+    return keys
+
+
+def text_layout_validation() -> dict:
+    environment = render_environment()
+    return {"fonts": environment["fonts"], "pillow": environment["pillow"]}
+
+
+def load_render_cache() -> dict:
+    try:
+        manifest = json.loads(RENDER_CACHE_FILE.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if manifest.get("version") != RENDER_CACHE_VERSION:
+        return {}
+    return manifest.get("visuals", {})
+
+
+def save_render_cache(entries: dict) -> None:
+    manifest = {"version": RENDER_CACHE_VERSION, "visuals": entries}
+    RENDER_CACHE_FILE.write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def is_cached(entry: dict | None, cache_key: str, path: Path) -> bool:
+    if not entry or entry.get("key") != cache_key or not path.exists():
+        return False
+    return entry.get("sha256") == file_digest(path)
+
+
+def variant_filename(filename: str, suffix: str) -> str:
+    extension = VECTOR_SUFFIX if filename.endswith(VECTOR_SUFFIX) else Path(filename).suffix
+    return f"{filename[: -len(extension)]}-{suffix}{extension}"
+
+
+def visual_dir(job_id: str) -> Path:
+    # Team variants of a visual are a cache, not deck sources, so they are
+    # kept apart from the tracked assets.
+    return VARIANT_ASSETS_DIR if "@" in job_id else ASSETS_DIR
+
+
+def prune_variant_visuals(entries: dict, current: set) -> None:
+    # Keeps the visuals of this run plus the most recently used others, up to
+    # VARIANT_ASSETS_LIMIT, and removes variant files no entry refers to.
+    older = sorted(
+        (job_id for job_id in entries if "@" in job_id and job_id not in current),
+        key=lambda job_id: entries[job_id].get("used", 0),
+        reverse=True,
+    )
+    for job_id in older[max(VARIANT_ASSETS_LIMIT - len(current), 0) :]:
+        del entries[job_id]
+    keep = {entry["file"] for job_id, entry in entries.items() if "@" in job_id}
+    for path in VARIANT_ASSETS_DIR.iterdir():
+        if path.name not in keep:
+            path.unlink()
+
+
+def plan_visual_jobs(option_sets: list) -> tuple:
+    # Every option set gets a full key -> path map, but a visual is rendered
+    # once per distinct set of options, so variants share unchanged files.
+    jobs, file_sets = {}, []
+    for visual_options in option_sets:
+        files = {}
+        for key, (filename, _) in VISUALS.items():
+            options = visual_options.get(key) or {}
+            filename = visual_filename(filename)
+            job_id = key
+            if options:
+                suffix = visual_options_digest(options)[:12]
+                job_id = f"{key}@{suffix}"
+                filename = variant_filename(filename, suffix)
+            jobs.setdefault(job_id, (key, visual_dir(job_id) / filename, options))
+            files[key] = jobs[job_id][1]
+        file_sets.append(files)
+    return jobs, file_sets
+
+
+def generate_image_sets(option_sets: list, jobs: int = 1, use_cache: bool = True, variants_only: bool = False) -> list:
+    visual_jobs, file_sets = plan_visual_jobs(option_sets)
+    variant_jobs = {job_id for job_id in visual_jobs if "@" in job_id}
+    if variants_only:
+        # The caller keeps the plain visuals current, so only the variant
+        # visuals are checked (and hashed) here.
+        visual_jobs = {job_id: visual_jobs[job_id] for job_id in variant_jobs}
     ASSETS_DIR.mkdir(exist_ok=True)
-    files = {
-        "cover": ASSETS_DIR / "cover_visual.png",
-        "top_mcp": ASSETS_DIR / "top_mcp_tools.png",
-        "top_skills": ASSETS_DIR / "top_agent_skills.png",
-        "architecture": ASSETS_DIR / "simple_architecture.png",
-        "prompt_formula": ASSETS_DIR / "prompt_formula.png",
-        "do_dont": ASSETS_DIR / "do_dont.png",
-        "common_errors": ASSETS_DIR / "common_errors_fixes.png",
-        "five_min_routine": ASSETS_DIR / "five_min_routine.png",
-        "settings_screen": ASSETS_DIR / "cursor_settings_screen.png",
-        "mcp_json_screen": ASSETS_DIR / "cursor_mcp_json_screen.png",
-        "status_screen": ASSETS_DIR / "cursor_status_screen.png",
-        "tutorial_path": ASSETS_DIR / "tutorial_path.png",
-        "daily_workflow": ASSETS_DIR / "daily_workflow.png",
-        "risk_controls": ASSETS_DIR / "risk_controls_simple.png",
-        "roadmap": ASSETS_DIR / "roadmap_30_60_90.png",
+    if variant_jobs:
+        VARIANT_ASSETS_DIR.mkdir(parents=True, exist_ok=True)
+
+    cache_keys = visual_cache_keys(visual_jobs)
+    cached = load_render_cache() if use_cache else {}
+    stale = [
+        job_id
+        for job_id, (_, path, _) in visual_jobs.items()
+        if not is_cached(cached.get(job_id), cache_keys[job_id], path)
+    ]
+    layout_validation = text_layout_validation()
+    if stale and not TEXT_LAYOUT.entries:
+        TEXT_LAYOUT.load(TEXT_LAYOUT_CACHE_FILE, layout_validation)
+
+    workers = min(resolve_jobs(jobs), len(stale))
+    if workers > 1:
+        # Each visual is drawn and encoded independently, so workers produce
+        # exactly the same PNG bytes as the serial loop below.
+        initargs = (FONTS.maxsize, TRACER.enabled, dict(RENDER_SETTINGS), THUMBNAIL_DIR)
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_render_worker, initargs=initargs) as pool:
+            for report in pool.map(render_visual, *zip(*(visual_jobs[job_id] for job_id in stale))):
+                FONTS.add_counts(*report["fonts"])
+                TEXT_LAYOUT.add_counts(*report["layouts"])
+                TEXT_LAYOUT.merge(report["layout_entries"])
+                TRACER.extend(report["events"])
+    else:
+        for job_id in stale:
+            render_visual(*visual_jobs[job_id])
+    TEXT_LAYOUT.save(TEXT_LAYOUT_CACHE_FILE, layout_validation)
+
+    # Entries for other variant sets stay while their files do, so a batch
+    # run and a plain run do not evict each other's visuals.
+    entries = {
+        job_id: entry
+        for job_id, entry in cached.items()
+        if job_id in visual_jobs or (visual_dir(job_id) / entry.get("file", "")).is_file()
     }
+    for job_id in stale:
+        path = visual_jobs[job_id][1]
+        entries[job_id] = {"key": cache_keys[job_id], "file": path.name, "sha256": file_digest(path)}
+    if variant_jobs:
+        used = 1 + max((entry.get("used", 0) for entry in entries.values()), default=0)
+        for job_id in variant_jobs:
+            entries[job_id] = {**entries[job_id], "used": used}
+        prune_variant_visuals(entries, variant_jobs)
+    if entries != cached:
+        save_render_cache(entries)
+    return file_sets
 
-    create_cover_visual(files["cover"])
-    create_top_mcp_visual(files["top_mcp"])
-    create_top_skills_visual(files["top_skills"])
-    create_architecture_visual(files["architecture"])
-    create_prompt_formula_visual(files["prompt_formula"])
-    create_do_dont_visual(files["do_dont"])
-    create_common_errors_visual(files["common_errors"])
-    create_five_min_routine_visual(files["five_min_routine"])
-    create_cursor_settings_screen(files["settings_screen"])
-    create_cursor_mcp_json_screen(files["mcp_json_screen"])
-    create_cursor_connection_status_screen(files["status_screen"])
-    create_tutorial_path_visual(files["tutorial_path"])
-    create_daily_workflow_visual(files["daily_workflow"])
-    create_risk_controls_visual(files["risk_controls"])
-    create_roadmap_visual(files["roadmap"])
-    return files
+
+def generate_images(jobs: int = 1, use_cache: bool = True) -> dict:
+    return generate_image_sets([{}], jobs=jobs, use_cache=use_cache)[0]
 
 
 def style_title(shape, text: str) -> None:
+    from pptx.dml.color import RGBColor
+    from pptx.enum.text import PP_ALIGN
+    from pptx.util import Pt
+
     tf = shape.text_frame
     tf.clear()
     p = tf.paragraphs[0]
@@ -659,6 +1444,9 @@ def style_title(shape, text: str) -> None:
 
 
 def add_title_block(slide, title: str, subtitle: str | None = None) -> None:
+    from pptx.dml.color import RGBColor
+    from pptx.util import Inches, Pt
+
     title_box = slide.shapes.add_textbox(Inches(0.45), Inches(0.16), Inches(12.2), Inches(0.72))
     style_title(title_box, title)
     if subtitle:
@@ -672,7 +1460,123 @@ def add_title_block(slide, title: str, subtitle: str | None = None) -> None:
         run.font.color.rgb = RGBColor(68, 86, 120)
 
 
+class TextMetrics:
+    # Advance widths are measured once per character at a reference size and
+    # scaled linearly, so measuring a line is a dict walk rather than a
+    # FreeType layout; fit results are memoized per text box, in an LRU since
+    # a watch session measures every edit of a spec.
+    REFERENCE_SIZE = 100
+
+    def __init__(self) -> None:
+        self._fonts = {}
+        self._advances = {}
+        self.fits = LRUCache(TEXT_FITS_LIMIT)
+
+    def font(self, face: str):
+        from PIL import ImageFont
+
+        font = self._fonts.get(face)
+        if font is None:
+            font_file = next((c for c in TEXT_FIT_FONTS[face] if Path(c).exists()), None)
+            if font_file:
+                font = ImageFont.truetype(font_file, self.REFERENCE_SIZE)
+            else:
+                font = ImageFont.load_default(self.REFERENCE_SIZE)
+            self._fonts[face] = font
+        return font
+
+    def width(self, face: str, text: str, size: float) -> float:
+        advances = self._advances.setdefault(face, {})
+        total = 0.0
+        for char in text:
+            advance = advances.get(char)
+            if advance is None:
+                advance = advances[char] = self.font(face).getlength(char) / self.REFERENCE_SIZE
+            total += advance
+        return total * size
+
+    def line_count(self, face: str, text: str, size: float, width: float) -> int:
+        # Greedy word wrap of each line break python-pptx writes, with words
+        # wider than the box broken by character the way PowerPoint does.
+        # Leading spaces (code indentation) stay on the first word.
+        lines = 0
+        space = self.width(face, " ", size)
+        for line in text.replace("\v", "\n").split("\n"):
+            indent = len(line) - len(line.lstrip(" "))
+            words = line[indent:].split(" ")
+            words[0] = line[:indent] + words[0]
+            lines += 1
+            current = 0.0
+            for word in words:
+                word_width = self.width(face, word, size)
+                if current and current + space + word_width > width:
+                    lines += 1
+                    current = 0.0
+                elif current:
+                    current += space
+                current += word_width
+                while current > width:
+                    lines += 1
+                    current -= width
+        return lines
+
+
+TEXT_METRICS = TextMetrics()
+
+
+def fitted_size(size: float, scale: float) -> float:
+    return size if scale == 1 else max(1.0, round(size * scale * 2) / 2)
+
+
+def text_paragraphs(kind: str, lines, sizes: tuple, scale: float) -> list:
+    # (text, point size, left indent, space after) in points, as add_bullets
+    # and add_code_block lay them out.
+    if kind == "code":
+        return [(line, fitted_size(sizes[0], scale), 0, 1) for line in lines]
+    paragraphs = []
+    for item in lines:
+        text, level = item if isinstance(item, (tuple, list)) else (item, 0)
+        paragraphs.append((text, fitted_size(sizes[0] if level == 0 else sizes[1], scale), 36 * level, 8))
+    return paragraphs
+
+
+def fit_text_box(kind: str, lines, w: float, h: float, sizes: tuple) -> dict:
+    key = (kind, tuple(tuple(item) if isinstance(item, list) else item for item in lines), w, h, sizes)
+    fit = TEXT_METRICS.fits.get(key)
+    if fit is not None:
+        return fit
+
+    # Default text insets are 0.1in left/right and 0.05in top/bottom; the
+    # rounded code block also loses its corner radius to the text area.
+    inset = 0.1 + (0.29289 * 0.16667 * min(w, h) if kind == "code" else 0)
+    width, available = (w - 2 * inset) * 72, (h - 0.1) * 72
+    face = "mono" if kind == "code" else "sans"
+
+    def needed(scale: float) -> float:
+        paragraphs = text_paragraphs(kind, lines, sizes, scale)
+        height = sum(
+            TEXT_METRICS.line_count(face, text, size, width - indent) * size * 1.2 + after
+            for text, size, indent, after in paragraphs
+        )
+        return height - (paragraphs[-1][3] if paragraphs else 0)
+
+    fit = {"needed": needed(1.0) / 72, "available": available / 72, "scale": 1.0, "fits": True}
+    if fit["needed"] * 72 > available:
+        scale = 1.0
+        while scale > TEXT_FIT_MIN_SCALE and needed(scale) > available:
+            scale = round(scale - 0.05, 2)
+        fit.update(scale=scale, fits=needed(scale) <= available)
+    TEXT_METRICS.fits[key] = fit
+    return fit
+
+
 def add_bullets(slide, lines, x=0.55, y=1.4, w=5.4, h=5.6, level0_size=21, level1_size=17) -> None:
+    from pptx.dml.color import RGBColor
+    from pptx.util import Inches, Pt
+
+    if TEXT_FIT == "shrink":
+        scale = fit_text_box("bullets", lines, w, h, (level0_size, level1_size))["scale"]
+        level0_size, level1_size = fitted_size(level0_size, scale), fitted_size(level1_size, scale)
     text_box = slide.shapes.add_textbox(Inches(x), Inches(y), Inches(w), Inches(h))
     tf = text_box.text_frame
     tf.clear()
@@ -690,11 +1594,178 @@ def add_bullets(slide, lines, x=0.55, y=1.4, w=5.4, h=5.6, level0_size=21, level
         p.space_after = Pt(8)
 
 
+class SharedImage:
+    def __init__(self, path: Path) -> None:
+        from pptx.parts.image import Image
+
+        # Only what parts and pictures need is kept; the bytes are streamed
+        # from `path` whenever a deck is written.
+        image = Image.from_file(str(path))
+        self.path = path
+        self.sha1 = image.sha1
+        self.ext, self.content_type, self.filename = image.ext, image.content_type, image.filename
+        # The EMU size python-pptx derives from the pixel size and DPI.
+        (width_px, height_px), (horz_dpi, vert_dpi) = image.size, image.dpi
+        self.native_size = (int(914400 * width_px / horz_dpi), int(914400 * height_px / vert_dpi))
+
+
+class ImageStore:
+    def __init__(self) -> None:
+        self._images = LRUCache(IMAGE_STORE_LIMIT)
+        self._parts = WeakKeyDictionary()
+        self._sources = WeakKeyDictionary()
+
+    def get(self, path: Path) -> SharedImage:
+        stat = os.stat(path)
+        key = (str(path), stat.st_mtime_ns, stat.st_size)
+        image = self._images.get(key)
+        if image is None:
+            image = self._images[key] = SharedImage(Path(path))
+        return image
+
+    def part(self, package, image: SharedImage):
+        # One image part per package and image, created on first use; later
+        # pictures relate to it without python-pptx re-reading the bytes.
+        # The part's blob stays empty: presentation_entries() puts the file
+        # in its place. Parts refer back to their package, so they are held
+        # weakly too.
+        from pptx.parts.image import ImagePart
+
+        parts = self._parts.setdefault(package, WeakValueDictionary())
+        part = parts.get(image.sha1)
+        if part is None:
+            partname = package.next_image_partname(image.ext)
+            part = parts[image.sha1] = ImagePart(partname, image.content_type, package, b"", image.filename)
+            self._sources[part] = image.path
+        return part
+
+    def sources(self, package) -> dict:
+        return {part.partname.membername: self._sources[part] for part in self._parts.get(package, {}).values()}
+
+
+IMAGE_STORE = ImageStore()
+VECTOR_DRAWINGS = LRUCache(VECTOR_DRAWINGS_LIMIT)
+VECTOR_SHAPES = {
+    "rectangle": "RECTANGLE",
+    "rounded_rectangle": "ROUNDED_RECTANGLE",
+    "ellipse": "OVAL",
+}
+
+
+def is_vector_drawing(path: Path) -> bool:
+    return str(path).endswith(VECTOR_SUFFIX)
+
+
+def load_vector_drawing(path: Path) -> dict:
+    stat = os.stat(path)
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    drawing = VECTOR_DRAWINGS.get(key)
+    if drawing is None:
+        drawing = VECTOR_DRAWINGS[key] = json.loads(Path(path).read_text(encoding="utf-8"))
+    return drawing
+
+
+def image_digest(path: Path) -> str:
+    if is_vector_drawing(path):
+        return file_digest(path)
+    return IMAGE_STORE.get(path).sha1
+
+
+def style_vector_shape(shape, fill, outline, width: float, emu_per_unit: float) -> None:
+    from pptx.dml.color import RGBColor
+    from pptx.util import Emu
+
+    if fill is not None:
+        shape.fill.solid()
+        shape.fill.fore_color.rgb = RGBColor(*fill)
+    else:
+        shape.fill.background()
+    if outline is not None and width:
+        shape.line.color.rgb = RGBColor(*outline)
+        shape.line.width = Emu(int(width * emu_per_unit))
+    else:
+        shape.line.fill.background()
+
+
+def add_vector_drawing(slide, drawing: dict, x: float, y: float, w: float) -> None:
+    from pptx.dml.color import RGBColor
+    from pptx.enum.shapes import MSO_CONNECTOR, MSO_SHAPE
+    from pptx.util import Emu, Inches
+
+    width, height = drawing["size"]
+    left, top = Inches(x), Inches(y)
+    k = Inches(w) / width
+
+    def emu(value: float) -> Emu:
+        return Emu(int(round(value * k)))
+
+    shapes = slide.shapes
+    background = shapes.add_shape(MSO_SHAPE.RECTANGLE, left, top, emu(width), emu(height))
+    style_vector_shape(background, drawing["background"], None, 0, k)
+
+    for op in drawing["ops"]:
+        kind = op["op"]
+        if kind in VECTOR_SHAPES:
+            x1, y1, x2, y2 = op["box"]
+            shape = shapes.add_shape(getattr(MSO_SHAPE, VECTOR_SHAPES[kind]), left + emu(x1), top + emu(y1), emu(x2 - x1), emu(y2 - y1))
+            if kind == "rounded_rectangle" and min(x2 - x1, y2 - y1) > 0:
+                shape.adjustments[0] = min(op["radius"] / min(x2 - x1, y2 - y1), 0.5)
+            style_vector_shape(shape, op["fill"], op["outline"], op["width"], k)
+        elif kind == "line":
+            for (x1, y1), (x2, y2) in zip(op["points"], op["points"][1:]):
+                connector = shapes.add_connector(MSO_CONNECTOR.STRAIGHT, left + emu(x1), top + emu(y1), left + emu(x2), top + emu(y2))
+                connector.line.color.rgb = RGBColor(*op["fill"])
+                connector.line.width = emu(max(op["width"], 1))
+        elif kind == "polygon":
+            (x0, y0), *rest = op["points"]
+            builder = shapes.build_freeform(x0, y0, scale=k)
+            builder.add_line_segments(rest, close=True)
+            shape = builder.convert_to_shape(left, top)
+            style_vector_shape(shape, op["fill"], op["outline"], op["width"], k)
+        elif kind == "text":
+            font = load_font(op["size"], bold=op["bold"])
+            ascent, descent = font.getmetrics()
+            bbox = measuring_draw().textbbox(op["xy"], op["text"], font=font)
+            box = shapes.add_textbox(left + emu(op["xy"][0]), top + emu(op["xy"][1]), emu(bbox[2] - op["xy"][0] + 8), emu(bbox[3] - op["xy"][1] + 8))
+            tf = box.text_frame
+            tf.word_wrap = False
+            tf.margin_left = tf.margin_right = tf.margin_top = tf.margin_bottom = 0
+            for idx, line in enumerate(op["text"].split("\n")):
+                p = tf.paragraphs[0] if idx == 0 else tf.add_paragraph()
+                p.line_spacing = emu(ascent + descent + 4)
+                run = p.add_run()
+                run.text = line
+                run.font.name = "DejaVu Sans"
+                run.font.size = emu(op["size"])
+                run.font.bold = op["bold"]
+                run.font.color.rgb = RGBColor(*(op["fill"] or (0, 0, 0)))
+
+
 def add_image(slide, image_path: Path, x=6.0, y=1.25, w=7.1) -> None:
-    slide.shapes.add_picture(str(image_path), Inches(x), Inches(y), width=Inches(w))
+    from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+    from pptx.util import Inches
+
+    if is_vector_drawing(image_path):
+        add_vector_drawing(slide, load_vector_drawing(image_path), x, y, w)
+        return
+    # Images are read and hashed once per build, and each deck registers one
+    # part per image, so this is add_picture() without the per-call re-read.
+    image = IMAGE_STORE.get(image_path)
+    rid = slide.part.relate_to(IMAGE_STORE.part(slide.part.package, image), RT.IMAGE)
+    native_w, native_h = image.native_size
+    cx = Inches(w)
+    cy = int(round(native_h * (float(cx) / float(native_w))))
+    shape_id = slide.shapes.element.max_shape_id + 1
+    slide.shapes.element.add_pic(shape_id, f"Picture {shape_id - 1}", image_path.name, rid, Inches(x), Inches(y), cx, cy)
 
 
 def add_code_block(slide, code_lines, x=0.55, y=1.75, w=12.2, h=5.2, font_size=14) -> None:
+    from pptx.dml.color import RGBColor
+    from pptx.enum.shapes import MSO_SHAPE
+    from pptx.util import Inches, Pt
+
+    if TEXT_FIT == "shrink":
+        font_size = fitted_size(font_size, fit_text_box("code", code_lines, w, h, (font_size,))["scale"])
     block = slide.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, Inches(x), Inches(y), Inches(w), Inches(h))
     block.fill.solid()
     block.fill.fore_color.rgb = RGBColor(22, 31, 49)
@@ -712,15 +1783,9 @@ def add_code_block(slide, code_lines, x=0.55, y=1.75, w=12.2, h=5.2, font_size=1
         p.space_before = Pt(0)
 
 
-def add_video_links_slide(
-    prs: Presentation,
-    blank_layout,
-    title: str,
-    subtitle: str,
-    links,
-) -> None:
-    slide = prs.slides.add_slide(blank_layout)
-    add_title_block(slide, title, subtitle)
+def add_link_columns(slide, links) -> None:
+    from pptx.dml.color import RGBColor
+    from pptx.util import Inches, Pt
 
     left = links[: len(links) // 2]
     right = links[len(links) // 2 :]
@@ -751,798 +1816,1483 @@ def add_video_links_slide(
     add_link_column(right, x=6.75, y=1.55, w=6.05, h=5.75, start_index=len(left) + 1)
 
 
-def build_participant_presentation(images: dict, output_file: Path) -> None:
+def read_deck_spec(path: Path) -> dict:
+    suffix = path.suffix.lower()
+    text = path.read_text(encoding="utf-8")
+    if suffix == ".json":
+        return json.loads(text)
+    if suffix == ".toml":
+        import tomllib
+
+        return tomllib.loads(text)
+    if suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError as exc:
+            raise RuntimeError(f"PyYAML is required to read {path}") from exc
+        return yaml.safe_load(text)
+    raise ValueError(f"Unsupported deck spec format: {path}")
+
+
+def has_placeholders(value) -> bool:
+    if isinstance(value, str):
+        return PLACEHOLDER.search(value) is not None
+    if isinstance(value, (list, tuple)):
+        return any(has_placeholders(item) for item in value)
+    if isinstance(value, dict):
+        return any(has_placeholders(item) for item in value.values())
+    return False
+
+
+def placeholder_text(value) -> str:
+    return "\n".join(value) if isinstance(value, list) else str(value)
+
+
+def expand_placeholders(value, context: dict):
+    if isinstance(value, str):
+        # A multi-line snippet inside other text keeps its line breaks, which
+        # python-pptx turns into breaks within the one paragraph.
+        return PLACEHOLDER.sub(lambda match: placeholder_text(context[match.group(1)]), value)
+    if isinstance(value, tuple):
+        return tuple(expand_placeholders(item, context) for item in value)
+    if isinstance(value, list):
+        # A list item that is only a placeholder for a list (a content
+        # snippet) is spliced in, so one code block can mix snippets and lines.
+        items = []
+        for item in value:
+            match = PLACEHOLDER.fullmatch(item) if isinstance(item, str) else None
+            if match and isinstance(context[match.group(1)], list):
+                items.extend(context[match.group(1)])
+            else:
+                items.append(expand_placeholders(item, context))
+        return items
+    if isinstance(value, dict):
+        return {key: expand_placeholders(item, context) for key, item in value.items()}
+    return value
+
+
+def compile_step(func, options: dict):
+    # Placeholders are found once at compile time; plain elements are called
+    # with their prepared arguments and never walked again.
+    if has_placeholders(options):
+        return lambda slide, images, context: func(slide, **expand_placeholders(options, context))
+    return lambda slide, images, context: func(slide, **options)
+
+
+def compile_element(element: dict):
+    options = {key: value for key, value in element.items() if key != "type"}
+    kind = element.get("type")
+    if kind == "bullets":
+        options["lines"] = [tuple(line) if isinstance(line, list) else line for line in options["lines"]]
+        return compile_step(add_bullets, options)
+    if kind == "code":
+        options["code_lines"] = options.pop("lines")
+        return compile_step(add_code_block, options)
+    if kind == "image":
+        key = options.pop("key")
+        return lambda slide, images, context: add_image(slide, images[key], **options)
+    if kind == "links":
+        source = options.pop("source")
+        return lambda slide, images, context: add_link_columns(slide, context[source])
+    raise ValueError(f"Unknown slide element type: {kind!r}")
+
+
+class CompiledSlide:
+    def __init__(self, spec: dict) -> None:
+        self.spec = spec
+        self.id = spec["id"]
+        self.title = spec["title"]
+        title_options = {"title": spec["title"], "subtitle": spec.get("subtitle")}
+        self.steps = [compile_step(add_title_block, title_options)]
+        self.steps.extend(compile_element(element) for element in spec.get("elements", []))
+
+    def build(self, slide, images: dict, context: dict) -> None:
+        for step in self.steps:
+            step(slide, images, context)
+
+    def fingerprint(self, images: dict, context: dict) -> str:
+        payload = {"spec": expand_placeholders(self.spec, context), "images": {}, "links": {}}
+        for element in self.spec.get("elements", []):
+            if element.get("type") == "image":
+                payload["images"][element["key"]] = image_digest(images[element["key"]])
+            elif element.get("type") == "links":
+                payload["links"][element["source"]] = context[element["source"]]
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class CompiledDeck:
+    def __init__(self, spec: dict) -> None:
+        self.spec = spec
+        self.name = spec.get("name", "deck")
+        self.slides = [CompiledSlide(slide) for slide in spec["slides"]]
+
+    def build(self, prs: Presentation, images: dict, context: dict | None = None, only=None) -> None:
+        context = {**deck_context(), **(context or {})}
+        blank = prs.slide_layouts[6]
+        for index, compiled in enumerate(self.slides):
+            if only is None or index in only:
+                with TRACER.span(f"slide:{compiled.id}", "slide", deck=self.name, index=index + 1):
+                    compiled.build(prs.slides.add_slide(blank), images, context)
+
+    def fingerprints(self, images: dict, context: dict | None = None) -> list:
+        context = {**deck_context(), **(context or {})}
+        return [compiled.fingerprint(images, context) for compiled in self.slides]
+
+
+def compile_deck_spec(spec: dict) -> CompiledDeck:
+    return CompiledDeck(spec)
+
+
+COMPILED_DECK_SPECS = LRUCache(COMPILED_DECK_SPECS_LIMIT)
+
+
+def load_deck_spec(path: Path) -> CompiledDeck:
+    path = Path(path)
+    key = (str(path), path.stat().st_mtime_ns)
+    compiled = COMPILED_DECK_SPECS.get(key)
+    if compiled is None:
+        compiled = COMPILED_DECK_SPECS[key] = compile_deck_spec(read_deck_spec(path))
+    return compiled
+
+
+def load_content() -> dict:
+    key = (str(CONTENT_FILE), CONTENT_FILE.stat().st_mtime_ns)
+    content = LOADED_CONTENT.get(key)
+    if content is None:
+        LOADED_CONTENT.clear()
+        content = LOADED_CONTENT[key] = read_deck_spec(CONTENT_FILE)
+    return content
+
+
+def mcp_json_context(servers) -> dict:
+    return {"mcp_json": mcp_json_lines(servers), "mcp_json_compact": mcp_json_lines(servers, compact=True)}
+
+
+def build_time() -> datetime:
+    if BUILD_EPOCH is None:
+        return datetime.now()
+    return datetime.fromtimestamp(BUILD_EPOCH, timezone.utc)
+
+
+def deck_context() -> dict:
+    return {
+        "build_date": build_time().strftime("%Y-%m-%d"),
+        "video_links": VIDEO_LINKS,
+        "team_suffix": "",
+        **load_content(),
+        **mcp_json_context(MCP_SERVERS),
+    }
+
+
+def new_presentation() -> Presentation:
+    from pptx import Presentation
+    from pptx.util import Inches
+
     prs = Presentation()
     prs.slide_width = Inches(13.333)
     prs.slide_height = Inches(7.5)
-    blank = prs.slide_layouts[6]
-
-    # 1) Cover
-    slide = prs.slides.add_slide(blank)
-    add_title_block(
-        slide,
-        "Solution Assessment: Cursor AI Capabilities and Integration Review",
-        "Spoon-feed training edition: simple English, clear steps, and full tutorial.",
-    )
-    add_bullets(
-        slide,
-        [
-            "What this deck gives you:",
-            ("- Top MCP tools for development", 1),
-            ("- Top agent skills to start fast", 1),
-            ("- Step-by-step setup in Cursor", 1),
-            ("- Commands your team can copy and run", 1),
-            f"Updated: {datetime.now().strftime('%Y-%m-%d')}",
-        ],
-        x=0.6,
-        y=1.55,
-        w=5.2,
-        h=4.8,
-    )
-    add_image(slide, images["cover"], x=5.95, y=1.22, w=7.15)
-
-    # 2) Learning goals
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "What your team will learn (easy words)")
-    add_bullets(
-        slide,
-        [
-            "1) What MCP is and why it helps developers.",
-            "2) Which MCP tools give the fastest value.",
-            "3) How to connect Jira, Figma, and Bitbucket in Cursor.",
-            "4) How to create reusable agent skills.",
-            "5) How to use safe controls so automation stays trusted.",
-        ],
-        x=0.9,
-        y=1.55,
-        w=11.2,
-        h=5.6,
-        level0_size=26,
-    )
+    if BUILD_EPOCH is not None:
+        pin_core_properties(prs)
+    return prs
+
+
+def pin_core_properties(prs: Presentation) -> None:
+    # python-pptx's template carries someone else's author and 2013 dates;
+    # reproducible builds stamp the build date instead.
+    stamp = build_time().replace(tzinfo=None)
+    core = prs.core_properties
+    core.author = core.last_modified_by = ""
+    core.created = core.modified = stamp
+    core.revision = 1
+
+
+def slide_manifest_path(output_file: Path) -> Path:
+    return output_file.with_name(f".{output_file.name}.slides.json")
+
+
+def deck_fingerprint() -> str:
+    import pptx
+
+    digest = hashlib.sha256(pptx.__version__.encode("utf-8"))
+    # The build date is stamped outside the slides too (core properties and
+    # zip member times), so a different one rules out patching.
+    digest.update(repr(BUILD_EPOCH).encode("utf-8"))
+    digest.update(source_digest(
+        new_presentation, style_title, add_title_block, add_bullets, add_image, add_vector_drawing, add_code_block, add_link_columns
+    ).encode("utf-8"))
+    if TEXT_FIT == "shrink":
+        digest.update(source_digest(TextMetrics, fitted_size, text_paragraphs, fit_text_box).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def output_stamp(path: Path) -> list:
+    stat = path.stat()
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def load_slide_manifest(output_file: Path) -> dict | None:
+    try:
+        manifest = json.loads(slide_manifest_path(output_file).read_text(encoding="utf-8"))
+        if manifest.get("output") != output_stamp(output_file):
+            return None
+    except (OSError, ValueError):
+        return None
+    return manifest
+
+
+def save_slide_manifest(output_file: Path, fingerprints: list) -> None:
+    manifest = {"deck": deck_fingerprint(), "slides": fingerprints, "output": output_stamp(output_file)}
+    slide_manifest_path(output_file).write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+
+
+def changed_slides(fingerprints: list, manifest: dict | None) -> list | None:
+    if not manifest or manifest.get("deck") != deck_fingerprint():
+        return None
+    previous = manifest.get("slides", [])
+    if len(previous) != len(fingerprints):
+        return None
+    return [index for index, (old, new) in enumerate(zip(previous, fingerprints)) if old != new]
+
+
+def rels_name(partname: str) -> str:
+    folder, name = posixpath.split(partname)
+    return f"{folder}/_rels/{name}.rels"
+
+
+@contextmanager
+def open_entry(value):
+    # A package entry is the member's bytes, the image file it comes from, or
+    # a (package file, member) pair read from another deck when written.
+    if isinstance(value, bytes):
+        yield io.BytesIO(value)
+    elif isinstance(value, Path):
+        with open(value, "rb") as handle:
+            yield handle
+    else:
+        source, name = value
+        with zipfile.ZipFile(source) as package, package.open(name) as member:
+            yield member
+
+
+def entry_digest(value) -> str:
+    if isinstance(value, Path):
+        return IMAGE_STORE.get(value).sha1
+    digest = hashlib.sha1()
+    with open_entry(value) as member:
+        for chunk in iter(lambda: member.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_zip_entries(source) -> dict:
+    # Media of a deck on disk are left in it until the entries are written.
+    with zipfile.ZipFile(source) as package:
+        return {
+            info.filename: (source, info.filename)
+            if isinstance(source, Path) and info.filename.startswith("ppt/media/")
+            else package.read(info)
+            for info in package.infolist()
+        }
+
+
+def presentation_entries(prs: Presentation) -> dict:
+    # python-pptx serializes the XML parts; image members are empty in its
+    # output (see ImageStore.part) and refer to their files instead.
+    package = io.BytesIO()
+    prs.save(package)
+    entries = read_zip_entries(package)
+    entries.update(IMAGE_STORE.sources(prs.part.package))
+    return entries
+
+
+def write_package(target, entries: dict) -> None:
+    # Members are written one at a time and copied in chunks, so memory does
+    # not grow with the number or size of the images.
+    names = list(entries)
+    if BUILD_EPOCH is not None:
+        names = ["[Content_Types].xml", *sorted(name for name in names if name != "[Content_Types].xml")]
+    with zipfile.ZipFile(target, "w", zipfile.ZIP_DEFLATED) as package:
+        for name in names:
+            with open_entry(entries[name]) as member, package.open(zip_member(name), "w") as copy:
+                copyfileobj(member, copy, 1 << 16)
+
+
+def write_zip_entries(output_file: Path, entries: dict) -> bool:
+    staging = output_file.with_name(f".{output_file.name}.tmp")
+    write_package(staging, entries)
+    return replace_if_changed(staging, output_file)
+
+
+def drop_unreferenced_media(entries: dict) -> None:
+    referenced = media_references(entries)
+    for name in [name for name in entries if name.startswith("ppt/media/") and name not in referenced]:
+        del entries[name]
+
+
+def media_references(entries: dict) -> dict:
+    from lxml import etree
+
+    references = {}
+    for name, blob in entries.items():
+        if not name.endswith(".rels"):
+            continue
+        source_dir = posixpath.dirname(posixpath.dirname(name))
+        for rel in etree.fromstring(blob):
+            target = posixpath.normpath(posixpath.join(source_dir, rel.get("Target")))
+            if rel.get("TargetMode") != "External" and target.startswith("ppt/media/"):
+                references.setdefault(target, []).append((name, rel.get("Id")))
+    return references
+
+
+def natural_key(name: str) -> list:
+    return [int(part) if part.isdigit() else part for part in re.split(r"(\d+)", name)]
+
+
+def media_report(output_file: Path) -> list:
+    with zipfile.ZipFile(output_file) as package:
+        rels = {info.filename: package.read(info) for info in package.infolist() if info.filename.endswith(".rels")}
+        media = [info for info in package.infolist() if info.filename.startswith("ppt/media/")]
+        references = media_references(rels)
+        # CRC and size narrow down candidates; only those blobs are hashed.
+        groups = {}
+        for info in media:
+            groups.setdefault((info.CRC, info.file_size), []).append(info)
+        digests = {
+            info.filename: hashlib.sha1(package.read(info)).hexdigest()
+            for group in groups.values()
+            if len(group) > 1
+            for info in group
+        }
+
+    first_by_digest = {}
+    report = []
+    for info in sorted(media, key=lambda item: natural_key(item.filename)):
+        digest = digests.get(info.filename)
+        first = first_by_digest.setdefault(digest, info.filename) if digest else info.filename
+        report.append(
+            {
+                "name": info.filename,
+                "bytes": info.file_size,
+                "stored_bytes": info.compress_size,
+                "refs": len(references.get(info.filename, [])),
+                "duplicate_of": None if first == info.filename else first,
+            }
+        )
+    return report
+
+
+def print_media_report(output_file: Path) -> None:
+    report = media_report(output_file)
+    total = sum(entry["bytes"] for entry in report)
+    duplicates = [entry for entry in report if entry["duplicate_of"]]
+    print(f"Media in {output_file.name}: {len(report)} parts, {total / 1024:.1f} KB, {len(duplicates)} duplicates")
+    for entry in report:
+        note = f"  DUPLICATE of {entry['duplicate_of']}" if entry["duplicate_of"] else ""
+        print(f"  {entry['name']:<24} {entry['bytes'] / 1024:>9.1f} KB  {entry['refs']:>2} refs{note}")
+
+
+def patch_slides(output_file: Path, patch: dict, replacements: dict) -> None:
+    entries = read_zip_entries(output_file)
+    merge_slide_patches(entries, [(patch, replacements)])
+    write_zip_entries(output_file, entries)
+
+
+def merge_slide_patches(entries: dict, patches: list) -> None:
+    # Each patch holds the entries of a package whose slides replace slides
+    # of `entries`; media is matched by content, so slides built apart still
+    # share one part.
+    from lxml import etree
+
+    media = {entry_digest(value): name for name, value in entries.items() if name.startswith("ppt/media/")}
+    content_types = etree.fromstring(entries["[Content_Types].xml"])
+    defaults = {node.get("Extension").lower() for node in content_types.iter(f"{{{CT_NS}}}Default")}
+
+    for patch, replacements in patches:
+        patch_types = etree.fromstring(patch["[Content_Types].xml"])
+        for source, target in replacements.items():
+            source_part = f"ppt/slides/slide{source}.xml"
+            target_part = f"ppt/slides/slide{target}.xml"
+            rels = etree.fromstring(patch[rels_name(source_part)])
+            for rel in rels:
+                media_name = posixpath.normpath(posixpath.join("ppt/slides", rel.get("Target")))
+                if rel.get("TargetMode") == "External" or not media_name.startswith("ppt/media/"):
+                    continue
+                digest = entry_digest(patch[media_name])
+                if digest not in media:
+                    ext = posixpath.splitext(media_name)[1]
+                    index = 1 + max((int(m) for m in re.findall(r"ppt/media/image(\d+)\.", " ".join(entries))), default=0)
+                    media[digest] = f"ppt/media/image{index}{ext}"
+                    entries[media[digest]] = patch[media_name]
+                    if ext[1:].lower() not in defaults:
+                        for node in patch_types.iter(f"{{{CT_NS}}}Default"):
+                            if node.get("Extension").lower() == ext[1:].lower():
+                                # python-pptx writes Defaults sorted by extension; keep that order.
+                                content_types.insert(sum(1 for other in defaults if other < ext[1:].lower()), node)
+                                defaults.add(ext[1:].lower())
+                rel.set("Target", posixpath.relpath(media[digest], "ppt/slides"))
+            entries[target_part] = patch[source_part]
+            entries[rels_name(target_part)] = etree.tostring(rels, encoding="UTF-8", standalone=True)
+
+    entries["[Content_Types].xml"] = etree.tostring(content_types, encoding="UTF-8", standalone=True)
+    drop_unreferenced_media(entries)
+
+
+def plan_deck(
+    deck: "CompiledDeck", images: dict, output_file: Path, context: dict | None, incremental: bool, slide_groups: int = 1
+):
+    fingerprints = deck.fingerprints(images, context)
+    changed = None
+    if incremental and output_file.exists():
+        changed = changed_slides(fingerprints, load_slide_manifest(output_file))
+
+    prs = new_presentation()
+    if changed is None and slide_groups > 1:
+        # Blank slides give the package the parts of a full build; the slide
+        # groups built by worker processes are merged over them in write_deck.
+        blank = prs.slide_layouts[6]
+        for _ in deck.slides:
+            prs.slides.add_slide(blank)
+    else:
+        deck.build(prs, images, context, only=None if changed is None else set(changed))
+    return prs, changed, fingerprints
+
+
+def split_slide_groups(count: int, groups: int) -> list:
+    groups = max(min(groups, count), 1)
+    bounds = [count * n // groups for n in range(groups + 1)]
+    return [list(range(start, end)) for start, end in zip(bounds, bounds[1:])]
+
+
+def build_slide_group(spec: dict, images: dict, context: dict, indices: list) -> dict:
+    first_event = len(TRACER.events)
+    prs = new_presentation()
+    compile_deck_spec(spec).build(prs, images, context, only=set(indices))
+    return {"entries": presentation_entries(prs), "events": TRACER.events[first_event:]}
+
+
+def build_slide_groups(images: dict, decks: list, context: dict | None, groups: int) -> dict:
+    context = {**deck_context(), **(context or {})}
+    tasks = [
+        (output_file, deck.spec, indices)
+        for deck, output_file in decks
+        for indices in split_slide_groups(len(deck.slides), groups)
+    ]
+    patches = {output_file: [] for _, output_file in decks}
+    initargs = (FONTS.maxsize, TRACER.enabled, dict(RENDER_SETTINGS), None, BUILD_EPOCH, TEXT_FIT)
+    with ProcessPoolExecutor(max_workers=min(groups, len(tasks)), initializer=init_render_worker, initargs=initargs) as pool:
+        futures = [pool.submit(build_slide_group, spec, images, context, indices) for _, spec, indices in tasks]
+        # Results are collected in task order, so the merge is the same
+        # whichever worker finishes first.
+        for (output_file, _, indices), future in zip(tasks, futures):
+            report = future.result()
+            TRACER.extend(report["events"])
+            patches[output_file].append((report["entries"], {n: index + 1 for n, index in enumerate(indices, start=1)}))
+    return patches
+
+
+def zip_member(name: str) -> zipfile.ZipInfo:
+    # Same member metadata ZipFile.writestr() would produce for a name, with
+    # the timestamp pinned to the build date in reproducible mode.
+    if BUILD_EPOCH is None:
+        date_time = time.localtime(time.time())[:6]
+    else:
+        date_time = time.gmtime(max(BUILD_EPOCH, ZIP_EPOCH))[:6]
+    info = zipfile.ZipInfo(name, date_time=date_time)
+    info.compress_type = zipfile.ZIP_DEFLATED
+    info.external_attr = 0o600 << 16
+    return info
+
+
+def save_presentation(prs: Presentation, target) -> None:
+    write_package(target, presentation_entries(prs))
+
+
+def replace_if_changed(staging: Path, output_file: Path) -> bool:
+    # Identical bytes leave the existing file (and its mtime) alone, so
+    # reproducible rebuilds do not look like changes downstream.
+    if output_file.exists() and output_file.stat().st_size == staging.stat().st_size:
+        if file_digest(output_file) == file_digest(staging):
+            staging.unlink()
+            return False
+    os.replace(staging, output_file)
+    return True
+
+
+def write_deck(
+    prs: Presentation, output_file: Path, changed: list | None, fingerprints: list, groups: list | None = None
+) -> bool:
+    replaced = True
+    with TRACER.span("write_deck", "zip", file=output_file.name) as span:
+        if groups is not None:
+            entries = presentation_entries(prs)
+            merge_slide_patches(entries, groups)
+            replaced = write_zip_entries(output_file, entries)
+        elif changed is None:
+            replaced = write_zip_entries(output_file, presentation_entries(prs))
+        elif changed:
+            # Slides in the patch deck are numbered 1..n in deck order; map them
+            # back onto the slide positions they replace.
+            patch_slides(output_file, presentation_entries(prs), {n: index + 1 for n, index in enumerate(changed, start=1)})
+        save_slide_manifest(output_file, fingerprints)
+        span["bytes"] = output_file.stat().st_size
+    return replaced
+
+
+def build_decks(
+    images: dict, decks, context: dict | None = None, incremental: bool = False, slide_groups: int = 1
+) -> list:
+    groups = resolve_jobs(slide_groups)
+    plans = [
+        (plan_deck(deck, images, output_file, context, incremental, groups), output_file) for deck, output_file in decks
+    ]
+    # Full rebuilds are split into contiguous slide groups assembled in
+    # separate processes, since slide assembly holds the GIL.
+    grouped = [(deck, output_file) for (deck, output_file), ((_, changed, _), _) in zip(decks, plans) if changed is None]
+    patches = build_slide_groups(images, grouped, context, groups) if groups > 1 and grouped else {}
+
+    # Zipping is mostly zlib work, which releases the GIL, so the decks are
+    # written side by side once all slides are in place.
+    with ThreadPoolExecutor(max_workers=max(len(plans), 1)) as pool:
+        futures = [
+            pool.submit(write_deck, prs, output_file, changed, fingerprints, patches.get(output_file))
+            for (prs, changed, fingerprints), output_file in plans
+        ]
+        replaced = [future.result() for future in futures]
+    # A full rebuild that produced the same bytes is reported as up to date.
+    return [
+        (output_file, [] if changed is None and not written else changed)
+        for ((_, changed, _), output_file), written in zip(plans, replaced)
+    ]
 
-    # 3) Agenda
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Agenda (spoon-feed order)")
-    add_bullets(
-        slide,
-        [
-            "Part A: Top MCP tools for development",
-            "Part B: Top agent skills for developers",
-            "Part C: Prompt formula + Do/Don't quick guide",
-            "Part D: Step-by-step Cursor setup tutorial",
-            "Part E: Common errors and quick fixes",
-            "Part F: Daily routine + risk controls + roadmap",
-        ],
-        x=0.95,
-        y=1.55,
-        w=11.0,
-        h=5.6,
-        level0_size=25,
-    )
 
-    # 4) Top MCP tools
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Top MCP tools that help development teams most")
-    add_bullets(
-        slide,
-        [
-            "Pick these first in your pilot:",
-            ("1) Bitbucket/Git MCP", 1),
-            ("2) Jira MCP", 1),
-            ("3) Figma MCP", 1),
-            ("4) Docs MCP", 1),
-            ("5) CI/CD MCP", 1),
-            ("6) Database MCP", 1),
-        ],
-    )
-    add_image(slide, images["top_mcp"], x=5.95, y=1.23, w=7.15)
-
-    # 5) Top skills
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Top agent skills to create first")
-    add_bullets(
-        slide,
-        [
-            "Build a small skill library in week 1:",
-            ("- jira-ticket-triage", 1),
-            ("- figma-handoff", 1),
-            ("- pr-quality-check", 1),
-            ("- release-note-writer", 1),
-            ("- bug-root-cause", 1),
-            ("- test-case-generator", 1),
-        ],
-    )
-    add_image(slide, images["top_skills"], x=5.95, y=1.23, w=7.15)
-
-    # 6) Architecture
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "How the connection works (simple architecture)")
-    add_bullets(
-        slide,
-        [
-            "Tools -> MCP layer -> Cursor -> Governance",
-            "MCP gives one common interface for each tool.",
-            "Cursor uses prompts + skills to call those tools.",
-            "Team rules control access, approvals, and logs.",
-        ],
-    )
-    add_image(slide, images["architecture"], x=5.95, y=1.23, w=7.15)
-
-    # 7) Prompt formula
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Prompt formula cheat sheet")
-    add_bullets(
-        slide,
-        [
-            "Use this every time:",
-            ("Context: where and what", 1),
-            ("Task: what output you need", 1),
-            ("Constraints: limits and rules", 1),
-            ("Output format: bullet/table/json", 1),
-        ],
-    )
-    add_image(slide, images["prompt_formula"], x=5.95, y=1.23, w=7.15)
-
-    # 8) Do and Don't
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Do and Don't (simple rules)")
-    add_bullets(
-        slide,
-        [
-            "Use this for new team members:",
-            ("Do: read-only first, then safe write with approval", 1),
-            ("Do: save good prompts as skills", 1),
-            ("Don't: use admin tokens", 1),
-            ("Don't: auto-merge without review", 1),
-        ],
-    )
-    add_image(slide, images["do_dont"], x=5.95, y=1.23, w=7.15)
-
-    # 9) Tutorial map
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Tutorial map: follow these 8 steps")
-    add_bullets(
-        slide,
-        [
-            "Trainer flow for one session (about 90 minutes):",
-            ("10 min demo + 25 min pair lab + 15 min review", 1),
-            ("Repeat for Jira, Figma, and Bitbucket", 1),
-            ("End with one reusable skill per developer", 1),
-        ],
-    )
-    add_image(slide, images["tutorial_path"], x=5.95, y=1.23, w=7.15)
-
-    # 10) Step 1 commands
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Step 1: Prepare local machine (copy and run)")
-    add_code_block(
-        slide,
-        [
-            "mkdir -p ~/cursor-mcp-training/{servers,skills,logs} && cd ~/cursor-mcp-training",
-            "python3 -m venv .venv",
-            "source .venv/bin/activate",
-            "python -m pip install --upgrade pip",
-            "pip install mcp httpx python-dotenv pyyaml",
-            "python --version && node --version && npm --version",
-            "sudo apt-get update && sudo apt-get install -y jq",
-            "",
-            "# Create environment file for tokens",
-            "cat > .env <<'EOF'",
-            "JIRA_BASE_URL=https://your-company.atlassian.net",
-            "JIRA_EMAIL=you@company.com",
-            "JIRA_API_TOKEN=<jira_token>",
-            "FIGMA_TOKEN=<figma_token>",
-            "BITBUCKET_WORKSPACE=<workspace>",
-            "BITBUCKET_USERNAME=<username>",
-            "BITBUCKET_APP_PASSWORD=<app_password>",
-            "EOF",
-        ],
-        y=1.55,
-        h=5.8,
-        font_size=14,
-    )
+def build_participant_presentation(images: dict, output_file: Path) -> None:
+    build_decks(images, [(load_deck_spec(DECK_SPECS["participant"]), output_file)])
 
-    # 11) Step 2 screenshot
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Step 2: Open Cursor settings and go to MCP")
-    add_bullets(
-        slide,
-        [
-            "Click Settings in Cursor.",
-            "Open Features tab.",
-            "Open MCP section.",
-            "Turn MCP ON.",
-            "Click Open mcp.json.",
-        ],
-        x=0.55,
-        y=1.55,
-        w=4.8,
-        h=5.5,
-        level0_size=25,
-    )
-    add_image(slide, images["settings_screen"], x=5.35, y=1.22, w=7.75)
-
-    # 12) Step 3 screenshot + config
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Step 3: Add mcp.json config in Cursor")
-    add_bullets(
-        slide,
-        [
-            "Paste this config in .cursor/mcp.json:",
-            "Use your own server script paths.",
-            "Save file and restart Cursor.",
-        ],
-        x=0.55,
-        y=1.4,
-        w=5.2,
-        h=1.8,
-        level0_size=22,
-    )
-    add_code_block(
-        slide,
-        [
-            "{",
-            '  "mcpServers": {',
-            '    "jira": {"command":"python","args":["servers/jira_server.py"],"envFile":".env"},',
-            '    "figma": {"command":"python","args":["servers/figma_server.py"],"envFile":".env"},',
-            '    "bitbucket": {"command":"python","args":["servers/bitbucket_server.py"],"envFile":".env"}',
-            "  }",
-            "}",
-        ],
-        x=0.55,
-        y=3.0,
-        w=5.2,
-        h=3.95,
-        font_size=13,
-    )
-    add_image(slide, images["mcp_json_screen"], x=5.95, y=1.22, w=7.15)
-
-    # 13) Step 4 token file
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Step 4: Add tokens in .env file")
-    add_code_block(
-        slide,
-        [
-            "cat > .env <<'EOF'",
-            "JIRA_BASE_URL=https://your-company.atlassian.net",
-            "JIRA_EMAIL=you@company.com",
-            "JIRA_API_TOKEN=<jira_token>",
-            "FIGMA_TOKEN=<figma_token>",
-            "BITBUCKET_WORKSPACE=<workspace>",
-            "BITBUCKET_USERNAME=<username>",
-            "BITBUCKET_APP_PASSWORD=<app_password>",
-            "EOF",
-            "",
-            "# Keep .env out of git",
-            "echo '.env' >> .gitignore",
-        ],
-        y=1.9,
-        h=4.95,
-        font_size=15,
-    )
-    add_bullets(
-        slide,
-        [
-            "Important:",
-            ("Never commit .env to repository.", 1),
-            ("Rotate tokens every 90 days.", 1),
-        ],
-        x=0.65,
-        y=6.95,
-        w=12.0,
-        h=0.5,
-        level0_size=17,
-        level1_size=15,
-    )
 
-    # 14) Step 5 Jira
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Step 5: Test Jira connection")
-    add_bullets(
-        slide,
-        [
-            "Run test command:",
-            ("curl -s -u \"$JIRA_EMAIL:$JIRA_API_TOKEN\" \"$JIRA_BASE_URL/rest/api/3/myself\" | jq '.displayName'", 1),
-            "Then ask in Cursor:",
-            ('"Using Jira MCP, summarize PROJ-101 and draft acceptance criteria."', 1),
-        ],
-        x=0.55,
-        y=1.55,
-        w=5.2,
-        h=5.2,
-        level0_size=22,
-        level1_size=15,
-    )
-    add_image(slide, images["status_screen"], x=5.95, y=1.22, w=7.15)
-
-    # 15) Step 6 Figma
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Step 6: Test Figma connection")
-    add_code_block(
-        slide,
-        [
-            "source .venv/bin/activate && source .env",
-            "export FIGMA_FILE_KEY=<file_key>",
-            "curl -s -H \"X-Figma-Token: $FIGMA_TOKEN\" \"https://api.figma.com/v1/files/$FIGMA_FILE_KEY\" | jq '.name'",
-            "",
-            "# Prompt in Cursor",
-            "Using Figma MCP, extract design tokens and map components to frontend stories.",
-        ],
-        x=0.55,
-        y=1.95,
-        w=5.2,
-        h=4.9,
-        font_size=14,
-    )
-    add_image(slide, images["status_screen"], x=5.95, y=1.22, w=7.15)
-
-    # 16) Step 7 Bitbucket
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Step 7: Test Bitbucket connection")
-    add_code_block(
-        slide,
-        [
-            "source .venv/bin/activate && source .env",
-            "curl -s -u \"$BITBUCKET_USERNAME:$BITBUCKET_APP_PASSWORD\" \\",
-            "  \"https://api.bitbucket.org/2.0/repositories/$BITBUCKET_WORKSPACE\" | jq '.values[0].full_name'",
-            "",
-            "# Prompt in Cursor",
-            "Using Bitbucket MCP, summarize PR #123 and create review checklist.",
-        ],
-        x=0.55,
-        y=1.95,
-        w=5.2,
-        h=4.9,
-        font_size=14,
-    )
-    add_image(slide, images["status_screen"], x=5.95, y=1.22, w=7.15)
-
-    # 17) Step 8 skill creation
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Step 8: Build your first agent skill")
-    add_code_block(
-        slide,
-        [
-            "mkdir -p skills/jira-ticket-triage && cd skills/jira-ticket-triage",
-            "cat > skill.yaml <<'YAML'",
-            "name: jira-ticket-triage",
-            "version: 1.0.0",
-            "description: Triage issue and return action plan",
-            "tools: [jira.search, jira.get_issue]",
-            "YAML",
-            "",
-            "cat > prompts.md <<'MD'",
-            "# Inputs: issue_key, team_context, done_definition",
-            "# Output: summary, acceptance criteria, test cases",
-            "MD",
-            "",
-            "echo '[{\"input\":\"PROJ-101\",\"assert_contains\":[\"Summary\",\"Acceptance\"]}]' > tests.json",
-        ],
-        y=1.75,
-        h=5.5,
-        font_size=14,
-    )
+def build_trainer_presentation(images: dict, output_file: Path) -> None:
+    build_decks(images, [(load_deck_spec(DECK_SPECS["trainer"]), output_file)])
+
+
+def markdown_value(value) -> str:
+    if isinstance(value, str):
+        return value
+    lines = []
+    for number, item in enumerate(value, start=1):
+        if isinstance(item, (list, tuple)):
+            title, url = item
+            marker = f"{number}. "
+            lines += [f"{marker}{title}  ", " " * len(marker) + url]
+        else:
+            lines.append(item)
+    return "\n".join(lines)
+
 
-    # 18) Common errors
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Common errors and fixes (use in live training)")
-    add_bullets(
-        slide,
-        [
-            "Most common issues:",
-            ("401: token expired or wrong", 1),
-            ("403: missing project/file permission", 1),
-            ("404: wrong key or URL", 1),
-            ("MCP not showing: restart Cursor after save", 1),
-        ],
-        level0_size=20,
-        level1_size=16,
+def write_tutorial(output_file: Path, context: dict | None = None) -> bool:
+    context = {
+        **deck_context(),
+        **(context or {}),
+        "participant_file": PARTICIPANT_OUTPUT_FILE.name,
+        "trainer_file": TRAINER_OUTPUT_FILE.name,
+        "legacy_file": LEGACY_OUTPUT_FILE.name,
+    }
+    template = TUTORIAL_TEMPLATE.read_text(encoding="utf-8")
+    text = PLACEHOLDER.sub(lambda match: markdown_value(context[match.group(1)]), template)
+    if output_file.exists() and output_file.read_text(encoding="utf-8") == text:
+        return False
+    output_file.write_text(text, encoding="utf-8")
+    return True
+
+
+def element_fit(element: dict, context: dict) -> dict | None:
+    kind = element.get("type")
+    if kind not in ("bullets", "code"):
+        return None
+    func = add_bullets if kind == "bullets" else add_code_block
+    defaults = {name: param.default for name, param in inspect.signature(func).parameters.items() if param.default is not param.empty}
+    options = {key: value for key, value in element.items() if key != "type"}
+    if kind == "bullets":
+        options["lines"] = [tuple(line) if isinstance(line, list) else line for line in options["lines"]]
+    options = {**defaults, **expand_placeholders(options, context)}
+    sizes = (options["level0_size"], options["level1_size"]) if kind == "bullets" else (options["font_size"],)
+    return fit_text_box(kind, options["lines"], options["w"], options["h"], sizes)
+
+
+def text_overflows(deck: CompiledDeck, context: dict | None = None) -> list:
+    # Same measurements add_bullets and add_code_block shrink with, taken from
+    # the expanded spec, so checking needs no slides and hits the fit cache.
+    context = {**deck_context(), **(context or {})}
+    overflows = []
+    for index, compiled in enumerate(deck.slides, start=1):
+        for element in compiled.spec.get("elements", []):
+            fit = element_fit(element, context)
+            if fit is not None and fit["scale"] < 1:
+                overflows.append({"slide": index, "id": compiled.id, "type": element["type"], **fit})
+    return overflows
+
+
+def print_text_overflows(decks: list, context: dict | None = None) -> None:
+    if TEXT_FIT == "off":
+        return
+    for deck, output_file in decks:
+        for overflow in text_overflows(deck, context):
+            message = (
+                f"Text overflow in {output_file.name} slide {overflow['slide']} ({overflow['id']}): "
+                f"{overflow['type']} needs {overflow['needed']:.2f}in of {overflow['available']:.2f}in"
+            )
+            if TEXT_FIT == "shrink":
+                message += f", shrunk to {overflow['scale']:.0%}" if overflow["fits"] else ", too long even at the minimum size"
+            print(message)
+
+
+def refresh_thumbnails(images: dict, thumbnail_dir: Path) -> dict:
+    # Visuals rendered in this run already wrote their thumbnail from the
+    # in-memory canvas; only cached ones with a missing or stale thumbnail
+    # are decoded again.
+    from PIL import Image
+
+    thumbnails = {}
+    for key, path in images.items():
+        if is_vector_drawing(path):
+            continue
+        thumbnail = thumbnail_dir / path.name
+        if not thumbnail.exists() or thumbnail.stat().st_mtime_ns < path.stat().st_mtime_ns:
+            with Image.open(path) as image:
+                save_thumbnail(image.convert("RGB"), thumbnail)
+        thumbnails[key] = thumbnail
+    return thumbnails
+
+
+def contact_sheet_slides(deck: CompiledDeck, context: dict) -> list:
+    slides = []
+    for index, compiled in enumerate(deck.slides, start=1):
+        keys = [element["key"] for element in compiled.spec.get("elements", []) if element.get("type") == "image"]
+        slides.append((index, expand_placeholders(compiled.title, context), keys[0] if keys else None))
+    return slides
+
+
+def write_contact_sheet_png(name: str, slides: list, thumbnails: dict, path: Path) -> None:
+    from PIL import Image, ImageDraw
+
+    pad, caption_h = 20, 64
+    thumb_h = thumbnail_size((CANVAS_W, CANVAS_H))[1]
+    card_w, card_h = THUMBNAIL_WIDTH + 2 * pad, thumb_h + caption_h + 2 * pad
+    rows = ceil(len(slides) / CONTACT_SHEET_COLUMNS)
+    sheet = Image.new("RGB", (CONTACT_SHEET_COLUMNS * card_w + pad, rows * card_h + 90), CANVAS_BACKGROUND)
+    draw = ImageDraw.Draw(sheet)
+    draw.text((pad, 28), f"{name} ({len(slides)} slides)", font=FONTS.get(30, bold=True), fill=(24, 45, 78))
+    caption_font, placeholder_font = FONTS.get(16), FONTS.get(20, bold=True)
+
+    for position, (index, title, key) in enumerate(slides):
+        x = pad + (position % CONTACT_SHEET_COLUMNS) * card_w
+        y = 90 + (position // CONTACT_SHEET_COLUMNS) * card_h
+        draw.rounded_rectangle((x, y, x + card_w - pad, y + card_h - pad), radius=10, fill=(255, 255, 255), outline=(190, 204, 226))
+        if key in thumbnails:
+            with Image.open(thumbnails[key]) as thumbnail:
+                sheet.paste(thumbnail, (x + pad // 2, y + pad // 2))
+        else:
+            box = (x + pad // 2, y + pad // 2, x + pad // 2 + THUMBNAIL_WIDTH, y + pad // 2 + thumb_h)
+            draw.rectangle(box, fill=(226, 234, 246))
+            draw.text(((box[0] + box[2]) // 2, (box[1] + box[3]) // 2), "Text slide", font=placeholder_font, fill=(110, 128, 160), anchor="mm")
+        caption = fill(f"{index}. {title}", 36).splitlines()[:2]
+        draw.multiline_text((x + pad // 2, y + pad + thumb_h), "\n".join(caption), font=caption_font, fill=(35, 53, 84), spacing=6)
+    sheet.save(path, format="PNG")
+
+
+def write_contact_sheet_html(name: str, slides: list, thumbnails: dict, path: Path) -> None:
+    cards = []
+    for index, title, key in slides:
+        if key in thumbnails:
+            src = html.escape(posixpath.relpath(thumbnails[key].as_posix(), path.parent.as_posix()))
+            figure = f'<img src="{src}" width="{THUMBNAIL_WIDTH}" alt="">'
+        else:
+            figure = '<div class="text-slide">Text slide</div>'
+        cards.append(f"<li>{figure}<span>{index}. {html.escape(title)}</span></li>")
+    path.write_text(
+        "<!DOCTYPE html>\n"
+        f'<html><head><meta charset="utf-8"><title>{html.escape(name)} contact sheet</title>'
+        "<style>body{font-family:sans-serif;background:#f4f8ff;color:#182d4e}"
+        "ol{display:grid;grid-template-columns:repeat(auto-fill,340px);gap:16px;list-style:none;padding:0}"
+        "li{background:#fff;border:1px solid #becce2;border-radius:8px;padding:10px}"
+        "span{display:block;margin-top:8px;font-size:14px}"
+        ".text-slide{width:320px;height:180px;background:#e2eaf6;display:flex;align-items:center;justify-content:center}"
+        "</style></head><body>\n"
+        f"<h1>{html.escape(name)} ({len(slides)} slides)</h1>\n<ol>\n" + "\n".join(cards) + "\n</ol>\n</body></html>\n",
+        encoding="utf-8",
     )
-    add_image(slide, images["common_errors"], x=5.95, y=1.23, w=7.15)
-
-    # 19) Five-minute routine
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "5-minute daily routine (adoption booster)")
-    add_bullets(
-        slide,
-        [
-            "Do this daily:",
-            ("Minute 1: pick top task", 1),
-            ("Minute 2: ask Cursor for plan", 1),
-            ("Minute 3: run quality skill", 1),
-            ("Minute 4: update status", 1),
-            ("Minute 5: save one useful prompt", 1),
-        ],
-        level0_size=20,
-        level1_size=16,
+
+
+def build_previews(images: dict, decks: list, preview_dir: Path, context: dict | None = None) -> list:
+    preview_dir.mkdir(parents=True, exist_ok=True)
+    with TRACER.span("build_previews", "preview"):
+        thumbnails = refresh_thumbnails(images, preview_dir / "thumbnails")
+        context = {**deck_context(), **(context or {})}
+        written = []
+        for deck, _ in decks:
+            slides = contact_sheet_slides(deck, context)
+            png_path = preview_dir / f"{deck.name}_contact_sheet.png"
+            html_path = preview_dir / f"{deck.name}_contact_sheet.html"
+            write_contact_sheet_png(deck.name, slides, thumbnails, png_path)
+            write_contact_sheet_html(deck.name, slides, thumbnails, html_path)
+            written += [png_path, html_path]
+    return written
+
+
+LEGACY_OUTPUT_STRATEGIES = ("auto", "copy", "hardlink", "symlink", "reflink")
+FICLONE = 0x40049409
+
+
+def reflink_file(source: Path, target: Path) -> None:
+    import fcntl
+
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+
+def link_output(source: Path, target: Path, strategy: str = "auto") -> str:
+    if strategy == "auto":
+        same_device = source.stat().st_dev == target.parent.stat().st_dev
+        strategy = "hardlink" if same_device else "copy"
+    if strategy == "hardlink" and target.exists() and os.path.samefile(source, target):
+        return strategy
+
+    # Build the alias beside the target and swap it in, so an existing legacy
+    # file (or a link to the previous build) is replaced atomically.
+    staging = target.with_name(f".{target.name}.tmp")
+    staging.unlink(missing_ok=True)
+    try:
+        if strategy == "hardlink":
+            os.link(source, staging)
+        elif strategy == "symlink":
+            os.symlink(os.path.relpath(source, target.parent), staging)
+        elif strategy == "reflink":
+            reflink_file(source, staging)
+        else:
+            copyfile(source, staging)
+    except (OSError, ImportError):
+        staging.unlink(missing_ok=True)
+        copyfile(source, staging)
+        strategy = "copy"
+    os.replace(staging, target)
+    return strategy
+
+
+def team_slug(team: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", team).strip("-").lower()
+    if not slug:
+        raise ValueError(f"Team name {team!r} has no usable characters for a file name")
+    return slug
+
+
+def parse_server_list(value) -> list:
+    if isinstance(value, str):
+        return [name for name in re.split(r"[\s,;]+", value) if name]
+    if not isinstance(value, (list, tuple)) or not all(isinstance(name, str) for name in value):
+        raise ValueError(f"MCP servers must be a list of names or a comma separated string: {value!r}")
+    return list(value)
+
+
+def parse_video_links(value) -> list:
+    # CSV cells hold "Title|URL" pairs separated by ";" or new lines.
+    if isinstance(value, str):
+        pairs = [item.split("|", 1) for item in re.split(r"[;\n]+", value) if item.strip()]
+    elif isinstance(value, (list, tuple)):
+        pairs = value
+    else:
+        raise ValueError(f"Video links must be a list of [title, URL] pairs: {value!r}")
+    links = []
+    for pair in pairs:
+        if not isinstance(pair, (list, tuple)) or len(pair) != 2 or not all(isinstance(item, str) for item in pair):
+            raise ValueError(f"Video link must be a title and a URL: {pair!r}")
+        links.append((pair[0].strip(), pair[1].strip()))
+    return links
+
+
+def read_variants(path: Path) -> list:
+    text = path.read_text(encoding="utf-8")
+    if path.suffix.lower() == ".csv":
+        rows = list(csv.DictReader(io.StringIO(text)))
+    elif path.suffix.lower() == ".json":
+        rows = json.loads(text)
+        rows = rows.get("variants", []) if isinstance(rows, dict) else rows
+    else:
+        raise ValueError(f"Unsupported variants file format: {path}")
+
+    variants, slugs = [], set()
+    for row in rows:
+        variant = parse_variant(row, str(path))
+        if variant["slug"] in slugs:
+            raise ValueError(f"Duplicate variant {variant['slug']!r} in {path}")
+        slugs.add(variant["slug"])
+        variants.append(variant)
+    return variants
+
+
+def parse_variant(row: dict, source: str) -> dict:
+    if not isinstance(row, dict):
+        raise ValueError(f"Every variant in {source} must be an object, got {row!r}")
+    team, slug = row.get("team") or "", row.get("slug") or ""
+    if not isinstance(team, str) or not isinstance(slug, str):
+        raise ValueError(f"Team names and slugs in {source} must be strings")
+    team = team.strip()
+    if not team:
+        raise ValueError(f"Every variant in {source} needs a team name")
+    # Missing or empty fields fall back to the defaults; anything else,
+    # including 0 or false from JSON, has to parse.
+    servers, links = row.get("mcp_servers"), row.get("video_links")
+    return {
+        "team": team,
+        "slug": team_slug(slug or team),
+        "mcp_servers": parse_server_list(MCP_SERVERS if servers in (None, "", []) else servers),
+        "video_links": parse_video_links(VIDEO_LINKS if links in (None, "", []) else links),
+    }
+
+
+def variant_visual_options(variant: dict) -> dict:
+    if tuple(variant["mcp_servers"]) == MCP_SERVERS:
+        return {}
+    return {"mcp_json_screen": {"servers": variant["mcp_servers"]}}
+
+
+def variant_context(variant: dict) -> dict:
+    return {
+        "team_suffix": f" for {variant['team']}",
+        "video_links": variant["video_links"],
+        **mcp_json_context(variant["mcp_servers"]),
+    }
+
+
+def variant_outputs(variant: dict, output_dir: Path) -> list:
+    return [
+        (DECK_SPECS["participant"], output_dir / f"{PARTICIPANT_OUTPUT_FILE.stem}_{variant['slug']}.pptx"),
+        (DECK_SPECS["trainer"], output_dir / f"{TRAINER_OUTPUT_FILE.stem}_{variant['slug']}.pptx"),
+    ]
+
+
+def build_variant_decks(outputs: list, images: dict, context: dict, incremental: bool) -> dict:
+    first_event = len(TRACER.events)
+    decks = [(load_deck_spec(spec_path), output_file) for spec_path, output_file in outputs]
+    with TRACER.span(f"variant:{outputs[0][1].stem}", "variant"):
+        results = build_decks(images, decks, context=context, incremental=incremental)
+    return {"results": results, "events": TRACER.events[first_event:]}
+
+
+def build_batch(variants: list, output_dir: Path, jobs: int = 1, use_cache: bool = True, incremental: bool = False) -> list:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with TRACER.span("generate_images", "stage", variants=len(variants)):
+        image_sets = generate_image_sets([variant_visual_options(variant) for variant in variants], jobs, use_cache)
+    tasks = [
+        (variant_outputs(variant, output_dir), images, variant_context(variant), incremental)
+        for variant, images in zip(variants, image_sets)
+    ]
+
+    with TRACER.span("build_decks", "stage", variants=len(variants)):
+        workers = min(resolve_jobs(jobs), len(tasks))
+        if workers > 1:
+            # Slide assembly holds the GIL, so variants are spread over
+            # processes; each worker keeps its own image store.
+            initargs = (FONTS.maxsize, TRACER.enabled, dict(RENDER_SETTINGS), None, BUILD_EPOCH, TEXT_FIT)
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_render_worker, initargs=initargs) as pool:
+                reports = list(pool.map(build_variant_decks, *zip(*tasks)))
+            for report in reports:
+                TRACER.extend(report["events"])
+        else:
+            reports = [build_variant_decks(*task) for task in tasks]
+    return [(variant, report["results"]) for variant, report in zip(variants, reports)]
+
+
+class ServiceBusy(RuntimeError):
+    pass
+
+
+class OutputCache:
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            blob = self._entries.get(key)
+            if blob is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return blob
+
+    def put(self, key: str, blob: bytes) -> None:
+        with self._lock:
+            self._entries[key] = blob
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": sum(len(blob) for blob in self._entries.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class DeckService:
+    # Keeps fonts, rendered visuals, compiled deck specs and shared image
+    # parts warm between requests. Rendering touches shared caches and files,
+    # so it is serialized; slide assembly runs in up to `concurrency` threads.
+    def __init__(self, concurrency: int, cache_size: int) -> None:
+        self.concurrency = concurrency
+        self.cache = OutputCache(cache_size)
+        self._slots = threading.BoundedSemaphore(concurrency)
+        self._render_lock = threading.Lock()
+        self._active_lock = threading.Lock()
+        self._active = 0
+        self._images = {}
+
+    def warm(self) -> None:
+        with self._render_lock:
+            self._images = generate_images()
+        for spec_path in DECK_SPECS.values():
+            load_deck_spec(spec_path)
+        for path in self._images.values():
+            if not is_vector_drawing(path):
+                IMAGE_STORE.get(path)
+
+    def build(self, request: dict) -> tuple:
+        deck_name = request.get("deck", "participant")
+        if not isinstance(deck_name, str) or deck_name not in DECK_SPECS:
+            raise ValueError(f"Unknown deck {deck_name!r}; expected one of {', '.join(DECK_SPECS)}")
+        fields = [field for field in VARIANT_FIELDS if field in request]
+        if fields and "team" not in request:
+            raise ValueError(f"{', '.join(fields)} only apply to a team deck; add a team name")
+        variant = parse_variant(request, "the request") if "team" in request else None
+        context = {**deck_context(), **(variant_context(variant) if variant else {})}
+        # The context carries the variant, build date and content snippets.
+        key = json.dumps(
+            {"deck": deck_name, "context": context, "settings": RENDER_SETTINGS, "text_fit": TEXT_FIT}, sort_keys=True
+        )
+        blob = self.cache.get(key)
+        if blob is not None:
+            return blob, True
+
+        if not self._slots.acquire(timeout=SERVE_QUEUE_TIMEOUT):
+            raise ServiceBusy(f"All {self.concurrency} build slots are busy")
+        with self._active_lock:
+            self._active += 1
+        try:
+            # The plain visuals were rendered by warm(); a variant renders
+            # only the visuals its options change.
+            options = variant_visual_options(variant) if variant else {}
+            images = self._images
+            if options:
+                with self._render_lock:
+                    images = generate_image_sets([options], variants_only=True)[0]
+            prs = new_presentation()
+            load_deck_spec(DECK_SPECS[deck_name]).build(prs, images, context)
+            buffer = io.BytesIO()
+            save_presentation(prs, buffer)
+            blob = buffer.getvalue()
+        finally:
+            with self._active_lock:
+                self._active -= 1
+            self._slots.release()
+        self.cache.put(key, blob)
+        return blob, False
+
+    def health(self) -> dict:
+        return {"status": "ok", "active": self._active, "concurrency": self.concurrency, "cache": self.cache.stats()}
+
+
+def make_deck_server(address: str, service: DeckService):
+    # http.server and socketserver are only imported in server mode.
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from socketserver import ThreadingMixIn, UnixStreamServer
+
+    class DeckRequestHandler(BaseHTTPRequestHandler):
+        server_version = "DeckService/1"
+
+        def address_string(self) -> str:
+            return self.client_address[0] if isinstance(self.client_address, tuple) else "unix"
+
+        def send_json(self, status: int, payload: dict) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:
+            if self.path == "/health":
+                self.send_json(200, service.health())
+            elif self.path == "/decks":
+                self.send_json(200, {"decks": list(DECK_SPECS)})
+            else:
+                self.send_json(404, {"error": f"No such endpoint: {self.path}"})
+
+        def do_POST(self) -> None:
+            if self.path != "/build":
+                self.send_json(404, {"error": f"No such endpoint: {self.path}"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length") or 0)
+            except ValueError:
+                length = -1
+            if length < 0:
+                self.send_json(400, {"error": "Content-Length must be a non-negative integer"})
+                return
+            if length > SERVE_MAX_REQUEST_BYTES:
+                self.send_json(413, {"error": f"Request body over {SERVE_MAX_REQUEST_BYTES} bytes"})
+                return
+            try:
+                request = json.loads(self.rfile.read(length) or b"{}")
+                if not isinstance(request, dict):
+                    raise ValueError("Request body must be a JSON object")
+                blob, cached = service.build(request)
+            except ServiceBusy as exc:
+                self.send_json(503, {"error": str(exc)})
+                return
+            except ValueError as exc:
+                self.send_json(400, {"error": str(exc)})
+                return
+            except Exception:
+                # The traceback stays in the server log; clients only learn
+                # that the build failed.
+                self.log_error("Deck build failed:\n%s", traceback.format_exc())
+                self.send_json(500, {"error": "Internal error while building the deck"})
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", PPTX_CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(blob)))
+            self.send_header("Content-Disposition", f'attachment; filename="{request.get("deck", "participant")}.pptx"')
+            self.send_header("X-Cache", "hit" if cached else "miss")
+            self.end_headers()
+            self.wfile.write(blob)
+
+    class UnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+        daemon_threads = True
+
+    if address.startswith("unix:"):
+        socket_path = Path(address[len("unix:") :])
+        # Only a stale socket from an earlier run is removed; any other file
+        # at the path is left alone.
+        try:
+            mode = socket_path.lstat().st_mode
+        except FileNotFoundError:
+            mode = None
+        if mode is not None:
+            if not S_ISSOCK(mode):
+                raise SystemExit(f"Refusing to serve on {socket_path}: it exists and is not a socket")
+            socket_path.unlink()
+        return UnixHTTPServer(str(socket_path), DeckRequestHandler)
+    host, _, port = address.rpartition(":")
+    return ThreadingHTTPServer((host or "127.0.0.1", int(port)), DeckRequestHandler)
+
+
+def serve(args: argparse.Namespace) -> None:
+    service = DeckService(args.serve_concurrency, args.serve_cache)
+    service.warm()
+    server = make_deck_server(args.serve, service)
+    print(f"Serving decks on {args.serve} (POST /build, GET /health), press Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.serve.startswith("unix:"):
+            Path(args.serve[len("unix:") :]).unlink(missing_ok=True)
+
+
+def describe_changes(changed: list | None) -> str:
+    if changed is None:
+        return ""
+    if not changed:
+        return " (up to date)"
+    return f" (patched slides {', '.join(str(index + 1) for index in changed)})"
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build the Cursor AI solution assessment decks and visuals.")
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=worker_count,
+        default=1,
+        metavar="N",
+        help="render visuals with N worker processes (0 = one per CPU, default: 1)",
     )
-    add_image(slide, images["five_min_routine"], x=5.95, y=1.23, w=7.15)
-
-    # 20) Daily workflow
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Daily workflow your team can follow")
-    add_bullets(
-        slide,
-        [
-            "Keep it simple:",
-            ("Morning plan -> Build -> Review -> Close", 1),
-            ("Save good prompts as team skills", 1),
-            ("Do weekly quality review", 1),
-        ],
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="re-render every visual even when its render cache key is unchanged",
     )
-    add_image(slide, images["daily_workflow"], x=5.95, y=1.23, w=7.15)
-
-    # 21) Risk controls
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Risk Management and Governance Controls (simple)")
-    add_bullets(
-        slide,
-        [
-            "Four must-have controls:",
-            ("1) Low-access tokens", 1),
-            ("2) Human approval for write actions", 1),
-            ("3) Audit logs for every automation", 1),
-            ("4) Weekly KPI and failure review", 1),
-        ],
+    parser.add_argument(
+        "--png-profile",
+        choices=sorted(PNG_PROFILES),
+        default=RENDER_SETTINGS["png_profile"],
+        help="PNG encoding: fast (low zlib level), small (adaptive palette + optimize) "
+        "or lossless-default (default: %(default)s)",
     )
-    add_image(slide, images["risk_controls"], x=5.95, y=1.23, w=7.15)
-
-    # 22) Roadmap
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "30-60-90 day adoption roadmap")
-    add_bullets(
-        slide,
-        [
-            "0-30 days: connect tools and train first squad.",
-            "31-60 days: publish top skills and run office hours.",
-            "61-90 days: scale to more teams and report KPI impact.",
-            "Target: 20% faster delivery with safe controls.",
-        ],
+    parser.add_argument(
+        "--backend",
+        choices=("raster", "vector"),
+        default=RENDER_SETTINGS["backend"],
+        help="raster: embed PNG visuals; vector: draw the same diagrams as native, editable slide shapes "
+        "(default: %(default)s)",
     )
-    add_image(slide, images["roadmap"], x=5.95, y=1.23, w=7.15)
-
-    # 23) Video links
-    add_video_links_slide(
-        prs,
-        blank,
-        title="Recommended video links for self-learning",
-        subtitle="Share these with the team after training for continued practice.",
-        links=VIDEO_LINKS,
+    parser.add_argument(
+        "--scale",
+        type=render_scale,
+        default=RENDER_SETTINGS["scale"],
+        metavar="FACTOR",
+        help=f"render visuals at FACTOR x the {CANVAS_W}x{CANVAS_H} canvas, e.g. 0.25 for draft previews (default: %(default)s)",
     )
-
-    # 24) Final checklist
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Final checklist for trainer and team")
-    add_bullets(
-        slide,
-        [
-            "Before session:",
-            ("Tokens ready and mcp.json template prepared", 1),
-            ("Pilot repo, Jira project, and Figma file selected", 1),
-            "During session:",
-            ("Everyone completes one end-to-end workflow", 1),
-            ("Everyone creates at least one simple skill", 1),
-            "After session:",
-            ("Review KPIs and improve weak prompts weekly", 1),
-            "",
-            "Q&A",
-        ],
-        x=0.9,
-        y=1.55,
-        w=5.2,
-        h=5.8,
+    parser.add_argument(
+        "--font-cache-size",
+        type=font_cache_size,
+        default=None,
+        metavar="N",
+        help="keep at most N loaded font faces (LRU); unbounded by default",
     )
-    add_image(slide, images["cover"], x=5.95, y=1.22, w=7.15)
-
-    prs.save(output_file)
-
-
-def build_trainer_presentation(images: dict, output_file: Path) -> None:
-    prs = Presentation()
-    prs.slide_width = Inches(13.333)
-    prs.slide_height = Inches(7.5)
-    blank = prs.slide_layouts[6]
-
-    # 1) Cover
-    slide = prs.slides.add_slide(blank)
-    add_title_block(
-        slide,
-        "Trainer Deck (45 min): Cursor AI + MCP Enablement",
-        "Facilitator version with talking points, pacing, and troubleshooting cues.",
+    parser.add_argument(
+        "--font-stats",
+        action="store_true",
+        help="print font cache hit/miss counts after rendering",
     )
-    add_bullets(
-        slide,
-        [
-            "Audience: developers and team leads",
-            "Goal: connect tools, run safe workflows, publish first skills",
-            "Format: short demo + labs + troubleshooting",
-            f"Updated: {datetime.now().strftime('%Y-%m-%d')}",
-        ],
-        x=0.6,
-        y=1.55,
-        w=5.2,
-        h=4.8,
+    parser.add_argument(
+        "--legacy-output",
+        choices=LEGACY_OUTPUT_STRATEGIES,
+        default="auto",
+        help="how to create the legacy deck from the participant deck "
+        "(auto = hardlink on the same filesystem, else copy; default: auto)",
     )
-    add_image(slide, images["cover"], x=5.95, y=1.22, w=7.15)
-
-    # 2) Run of show
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "45-minute trainer run-of-show")
-    add_bullets(
-        slide,
-        [
-            "0-5 min: explain MCP in simple terms",
-            "5-12 min: show Top MCP and Top Skills",
-            "12-22 min: live setup in Cursor settings",
-            "22-34 min: Jira/Figma/Bitbucket connection tests",
-            "34-40 min: build one simple agent skill",
-            "40-45 min: common errors, Q&A, next steps",
-        ],
-        x=0.8,
-        y=1.55,
-        w=11.3,
-        h=5.7,
-        level0_size=24,
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="patch only the slides whose content, images or geometry changed since the last build",
     )
-
-    # 3) What to teach first
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "What to teach first (order matters)")
-    add_bullets(
-        slide,
-        [
-            "1) Top MCP tools",
-            "2) Top agent skills",
-            "3) Prompt formula",
-            "4) Do/Don't safe rules",
-            "5) Setup steps and command practice",
-            "6) Common errors and quick fixes",
-        ],
-        x=0.95,
-        y=1.55,
-        w=11.0,
-        h=5.6,
-        level0_size=25,
+    parser.add_argument(
+        "--text-fit",
+        choices=TEXT_FIT_MODES,
+        default=TEXT_FIT,
+        help="check bullet and code text against its box with cached font metrics: warn lists overflows, "
+        "shrink also scales their font sizes down to fit (default: %(default)s)",
     )
-
-    # 4) Top MCP
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Top MCP tools for development teams")
-    add_bullets(
-        slide,
-        [
-            "Use these in your pilot first:",
-            ("Bitbucket/Git, Jira, Figma", 1),
-            ("Docs MCP, CI/CD MCP, Database MCP", 1),
-            "Reason: fast wins and clear ROI",
-        ],
+    parser.add_argument(
+        "--slide-groups",
+        type=worker_count,
+        default=1,
+        metavar="N",
+        help="assemble each deck as N contiguous slide groups in worker processes and merge them in slide "
+        "order (0 = one per CPU, default: 1)",
     )
-    add_image(slide, images["top_mcp"], x=5.95, y=1.23, w=7.15)
-
-    # 5) Top Skills
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Top starter agent skills")
-    add_bullets(
-        slide,
-        [
-            "Required first set:",
-            ("jira-ticket-triage", 1),
-            ("figma-handoff", 1),
-            ("pr-quality-check", 1),
-            ("release-note-writer", 1),
-            ("bug-root-cause", 1),
-            ("test-case-generator", 1),
-        ],
+    parser.add_argument(
+        "--trace",
+        type=Path,
+        metavar="PATH",
+        help="record spans for visuals, PNG encoding, slides and deck writes to PATH",
     )
-    add_image(slide, images["top_skills"], x=5.95, y=1.23, w=7.15)
-
-    # 6) Prompt formula
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Prompt formula (repeat every demo)")
-    add_bullets(
-        slide,
-        [
-            "Trainer talking line:",
-            ('"Context + Task + Constraints + Output format"', 1),
-            "Ask participants to use this format in all labs.",
-            "This reduces confusion and bad outputs.",
-        ],
+    parser.add_argument(
+        "--trace-format",
+        choices=("chrome", "log"),
+        default="chrome",
+        help="trace output format: Chrome trace-event JSON or a plain log (default: chrome)",
     )
-    add_image(slide, images["prompt_formula"], x=5.95, y=1.23, w=7.15)
-
-    # 7) Do/Don't
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Do and Don't (safety first)")
-    add_bullets(
-        slide,
-        [
-            "Call this out clearly before labs:",
-            ("Do: use read-only first", 1),
-            ("Do: request approval before write actions", 1),
-            ("Don't: use admin tokens", 1),
-            ("Don't: skip review/checklist", 1),
-        ],
+    parser.add_argument(
+        "--reproducible",
+        action="store_true",
+        help="byte-identical decks for identical inputs: build date from SOURCE_DATE_EPOCH, fixed zip "
+        "timestamps and member order, pinned core properties (implied when SOURCE_DATE_EPOCH is set)",
     )
-    add_image(slide, images["do_dont"], x=5.95, y=1.23, w=7.15)
-
-    # 8) Setup commands
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Lab setup commands (copy and run)")
-    add_code_block(
-        slide,
-        [
-            "mkdir -p ~/cursor-mcp-training/{servers,skills,logs} && cd ~/cursor-mcp-training",
-            "python3 -m venv .venv && source .venv/bin/activate",
-            "python -m pip install --upgrade pip",
-            "pip install mcp httpx python-dotenv pyyaml",
-            "",
-            "cat > .env <<'EOF'",
-            "JIRA_BASE_URL=https://your-company.atlassian.net",
-            "JIRA_EMAIL=you@company.com",
-            "JIRA_API_TOKEN=<jira_token>",
-            "FIGMA_TOKEN=<figma_token>",
-            "BITBUCKET_WORKSPACE=<workspace>",
-            "BITBUCKET_USERNAME=<username>",
-            "BITBUCKET_APP_PASSWORD=<app_password>",
-            "EOF",
-        ],
-        y=1.75,
-        h=5.45,
-        font_size=14,
+    parser.add_argument(
+        "--preview",
+        action="store_true",
+        help="write asset thumbnails and a PNG and HTML contact sheet per deck to presentation_previews/",
     )
-
-    # 9) Cursor settings screenshot
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Live demo: Cursor settings -> MCP")
-    add_bullets(
-        slide,
-        [
-            "Step 1: open Settings",
-            "Step 2: Features -> MCP",
-            "Step 3: switch MCP to ON",
-            "Step 4: open mcp.json",
-        ],
-        x=0.55,
-        y=1.55,
-        w=4.7,
-        h=5.4,
-        level0_size=24,
+    parser.add_argument(
+        "--media-report",
+        action="store_true",
+        help="after building, list each deck's media parts with sizes, reference counts and duplicates",
     )
-    add_image(slide, images["settings_screen"], x=5.35, y=1.22, w=7.75)
-
-    # 10) mcp.json screenshot
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Live demo: mcp.json content")
-    add_code_block(
-        slide,
-        [
-            "{",
-            '  "mcpServers": {',
-            '    "jira": {"command":"python","args":["servers/jira_server.py"],"envFile":".env"},',
-            '    "figma": {"command":"python","args":["servers/figma_server.py"],"envFile":".env"},',
-            '    "bitbucket": {"command":"python","args":["servers/bitbucket_server.py"],"envFile":".env"}',
-            "  }",
-            "}",
-            "",
-            "# Save and restart Cursor",
-        ],
-        x=0.55,
-        y=2.1,
-        w=5.2,
-        h=4.8,
-        font_size=13,
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="stay running and rebuild only the visuals and slides affected by edits to this script or the deck specs",
     )
-    add_image(slide, images["mcp_json_screen"], x=5.95, y=1.22, w=7.15)
-
-    # 11) Connection tests
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Live demo: test connections (Jira/Figma/Bitbucket)")
-    add_code_block(
-        slide,
-        [
-            "# Jira",
-            "curl -s -u \"$JIRA_EMAIL:$JIRA_API_TOKEN\" \"$JIRA_BASE_URL/rest/api/3/myself\" | jq '.displayName'",
-            "",
-            "# Figma",
-            "curl -s -H \"X-Figma-Token: $FIGMA_TOKEN\" \"https://api.figma.com/v1/files/$FIGMA_FILE_KEY\" | jq '.name'",
-            "",
-            "# Bitbucket",
-            "curl -s -u \"$BITBUCKET_USERNAME:$BITBUCKET_APP_PASSWORD\" \"https://api.bitbucket.org/2.0/repositories/$BITBUCKET_WORKSPACE\" | jq '.values[0].full_name'",
-        ],
-        x=0.55,
-        y=2.0,
-        w=5.2,
-        h=4.9,
-        font_size=12,
+    parser.add_argument(
+        "--serve",
+        metavar="ADDRESS",
+        help="run a deck service on HOST:PORT or unix:/path/to.sock; POST /build with "
+        '{"deck", "team", "mcp_servers", "video_links"} returns the .pptx bytes',
     )
-    add_image(slide, images["status_screen"], x=5.95, y=1.22, w=7.15)
-
-    # 12) Common errors
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Live support slide: common errors and fixes")
-    add_bullets(
-        slide,
-        [
-            "Use this during Q&A:",
-            ("401 -> token issue", 1),
-            ("403 -> permission issue", 1),
-            ("404 -> wrong key/url", 1),
-            ("MCP not listed -> restart Cursor", 1),
-        ],
+    parser.add_argument(
+        "--serve-concurrency",
+        type=positive_count,
+        default=2,
+        metavar="N",
+        help="decks the service assembles at once; further requests wait up to "
+        f"{SERVE_QUEUE_TIMEOUT}s, then get 503 (default: %(default)s)",
     )
-    add_image(slide, images["common_errors"], x=5.95, y=1.23, w=7.15)
-
-    # 13) 5-minute routine
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Coach this habit: 5-minute daily routine")
-    add_bullets(
-        slide,
-        [
-            "Ask every participant to follow this daily.",
-            "This is the easiest way to keep adoption active.",
-            "Review weekly and celebrate improvements.",
-        ],
+    parser.add_argument(
+        "--serve-cache",
+        type=positive_count,
+        default=32,
+        metavar="N",
+        help="recent service outputs kept in memory (LRU, default: %(default)s)",
     )
-    add_image(slide, images["five_min_routine"], x=5.95, y=1.23, w=7.15)
-
-    # 14) Risk controls and roadmap
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Risk controls and 30-60-90 rollout")
-    add_bullets(
-        slide,
-        [
-            "Must-have controls:",
-            ("Low-access tokens + human approvals", 1),
-            ("Audit logs + weekly KPI review", 1),
-            "Rollout: 0-30 connect, 31-60 standardize, 61-90 scale.",
-        ],
-        level0_size=19,
-        level1_size=16,
+    parser.add_argument(
+        "--list",
+        action="store_true",
+        help="list the slides of each deck and the visual assets, then exit without building",
     )
-    add_image(slide, images["roadmap"], x=5.95, y=1.23, w=7.15)
-
-    # 15) Video links for homework
-    add_video_links_slide(
-        prs,
-        blank,
-        title="Recommended video links (share as homework)",
-        subtitle="Use these links to support practice after the 45-minute session.",
-        links=VIDEO_LINKS,
+    parser.add_argument(
+        "--variants",
+        type=Path,
+        metavar="PATH",
+        help="build a participant and trainer deck per team listed in a CSV or JSON file "
+        "(columns: team, mcp_servers, video_links, optional slug)",
     )
-
-    # 16) Final trainer checklist
-    slide = prs.slides.add_slide(blank)
-    add_title_block(slide, "Trainer checklist (before, during, after)")
-    add_bullets(
-        slide,
-        [
-            "Before: test tokens and demo environment.",
-            "During: keep prompts simple and repeat formula.",
-            "During: pause at each error and show quick fix.",
-            "After: share participant deck and runbook.",
-            "After: schedule weekly office hours.",
-            "",
-            "Q&A",
-        ],
-        x=0.8,
-        y=1.55,
-        w=5.5,
-        h=5.7,
+    parser.add_argument(
+        "--variants-output",
+        type=Path,
+        default=BATCH_OUTPUT_DIR,
+        metavar="DIR",
+        help="directory for --variants decks (default: team_decks next to this script)",
     )
-    add_image(slide, images["cover"], x=5.95, y=1.22, w=7.15)
-
-    prs.save(output_file)
+    args = parser.parse_args(argv)
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    args.build_epoch = None
+    if epoch is not None:
+        if not epoch.isdigit():
+            parser.error(f"SOURCE_DATE_EPOCH must be a Unix timestamp, got {epoch!r}")
+        args.build_epoch = int(epoch)
+    elif args.reproducible:
+        parser.error("--reproducible needs SOURCE_DATE_EPOCH to fix the build date")
+    if args.preview and args.variants:
+        parser.error("--preview cannot be combined with --variants")
+    return args
+
+
+def split_module_source(source: str) -> tuple:
+    # Top-level statements start at column 0, so whole lines are enough;
+    # ast.get_source_segment() re-splits the file for every node.
+    lines = source.splitlines(keepends=True)
+    functions, other = {}, []
+    for node in ast.parse(source).body:
+        start = min([node.lineno, *(decorator.lineno for decorator in getattr(node, "decorator_list", []))])
+        segment = "".join(lines[start - 1 : node.end_lineno])
+        if isinstance(node, ast.FunctionDef) and not node.decorator_list:
+            functions[node.name] = (node, segment)
+        else:
+            other.append(segment)
+    return functions, other
+
+
+def hot_swap_functions(path: Path, previous: str, current: str) -> list | None:
+    # Only edits inside plain top-level functions are applied in place; the
+    # caller restarts the process for anything else. Swapping __code__ keeps
+    # every existing reference (VISUALS, RENDER_HELPERS) pointing at the
+    # edited body, and the warm font, layout and image caches survive.
+    old_functions, old_other = split_module_source(previous)
+    new_functions, new_other = split_module_source(current)
+    if old_other != new_other or old_functions.keys() != new_functions.keys():
+        return None
+
+    module_globals = globals()
+    edited = []
+    for name, (node, segment) in new_functions.items():
+        old_node, old_segment = old_functions[name]
+        if segment == old_segment and node.lineno == old_node.lineno:
+            continue
+        # Functions that merely moved are recompiled too, so inspect.getsource()
+        # (and with it the render cache keys) reads the right lines.
+        module = ast.Module(body=[node], type_ignores=[])
+        code = compile(module, str(path), "exec", flags=__future__.annotations.compiler_flag, dont_inherit=True)
+        namespace = {}
+        exec(code, module_globals, namespace)
+        target, fresh = module_globals[name], namespace[name]
+        target.__code__ = fresh.__code__
+        target.__defaults__ = fresh.__defaults__
+        target.__kwdefaults__ = fresh.__kwdefaults__
+        if segment != old_segment:
+            edited.append(name)
+    linecache.checkcache(str(path))
+    return edited
+
+
+def watched_files(args: argparse.Namespace) -> list:
+    files = [Path(__file__).resolve(), *DECK_SPECS.values(), CONTENT_FILE, TUTORIAL_TEMPLATE]
+    if args.variants:
+        files.append(args.variants)
+    return files
 
 
-def main() -> None:
-    images = generate_images()
-    build_participant_presentation(images, PARTICIPANT_OUTPUT_FILE)
-    copyfile(PARTICIPANT_OUTPUT_FILE, LEGACY_OUTPUT_FILE)
-    build_trainer_presentation(images, TRAINER_OUTPUT_FILE)
-    print(f"Created participant deck: {PARTICIPANT_OUTPUT_FILE}")
-    print(f"Created trainer deck: {TRAINER_OUTPUT_FILE}")
-    print(f"Updated legacy deck: {LEGACY_OUTPUT_FILE}")
+def file_stamps(files: list) -> dict:
+    stamps = {}
+    for path in files:
+        try:
+            stamps[path] = path.stat().st_mtime_ns
+        except OSError:
+            stamps[path] = None
+    return stamps
+
+
+def watch(args: argparse.Namespace) -> None:
+    # Rebuilds reuse the render cache and incremental deck patching, so an
+    # edit re-renders only the visuals and slides whose inputs changed.
+    args.incremental = True
+    script = Path(__file__).resolve()
+    source = script.read_text(encoding="utf-8")
+    run_once(args)
+    files = watched_files(args)
+    stamps = file_stamps(files)
+    print(f"Watching {len(files)} files, press Ctrl+C to stop.")
+    try:
+        while True:
+            time.sleep(WATCH_INTERVAL)
+            current = file_stamps(files)
+            if current == stamps:
+                continue
+            changed = [path for path in files if current[path] != stamps[path]]
+            stamps = current
+            if script in changed:
+                updated = script.read_text(encoding="utf-8")
+                try:
+                    edited = hot_swap_functions(script, source, updated)
+                except SyntaxError as exc:
+                    print(f"Not rebuilding, {script.name} does not parse: {exc}")
+                    continue
+                if edited is None:
+                    print(f"{script.name} changed outside function bodies, restarting.")
+                    os.execv(sys.executable, [sys.executable, *sys.argv])
+                source = updated
+                if edited:
+                    print(f"Reloaded {', '.join(edited)}")
+            started = time.perf_counter()
+            try:
+                run_once(args)
+            except Exception as exc:
+                print(f"Rebuild failed: {exc!r}")
+                continue
+            print(f"Rebuilt in {time.perf_counter() - started:.2f}s after changes to {', '.join(path.name for path in changed)}")
+    except KeyboardInterrupt:
+        pass
+
+
+def main(argv=None) -> None:
+    global THUMBNAIL_DIR, BUILD_EPOCH, TEXT_FIT
+    args = parse_args(argv)
+    BUILD_EPOCH = args.build_epoch
+    TEXT_FIT = args.text_fit
+    FONTS.configure(args.font_cache_size)
+    TRACER.enabled = args.trace is not None
+    RENDER_SETTINGS["png_profile"] = args.png_profile
+    RENDER_SETTINGS["backend"] = args.backend
+    # Vector drawings are replayed at slide size, so a raster scale has no meaning there.
+    RENDER_SETTINGS["scale"] = 1.0 if args.backend == "vector" else args.scale
+    if args.preview:
+        THUMBNAIL_DIR = PREVIEW_DIR / "thumbnails"
+    if args.list:
+        list_contents()
+        return
+    if args.serve:
+        serve(args)
+        return
+    if args.watch:
+        watch(args)
+        return
+    run_once(args)
+
+
+def run_once(args: argparse.Namespace) -> None:
+    if args.variants:
+        run_batch(args)
+    else:
+        run_build(args)
+
+
+def run_build(args: argparse.Namespace) -> None:
+    with TRACER.span("generate_images", "stage"):
+        images = generate_images(jobs=args.jobs, use_cache=not args.no_cache)
+    decks = [
+        (load_deck_spec(DECK_SPECS["participant"]), PARTICIPANT_OUTPUT_FILE),
+        (load_deck_spec(DECK_SPECS["trainer"]), TRAINER_OUTPUT_FILE),
+    ]
+    # Thumbnail resizing and PNG encoding release the GIL, so previews are
+    # drawn on a side thread while the decks are assembled.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        previews = pool.submit(build_previews, images, decks, PREVIEW_DIR) if args.preview else None
+        with TRACER.span("build_decks", "stage"):
+            results = build_decks(images, decks, incremental=args.incremental, slide_groups=args.slide_groups)
+        with TRACER.span("write_tutorial", "stage"):
+            tutorial_written = write_tutorial(TUTORIAL_OUTPUT_FILE)
+        preview_files = previews.result() if previews else []
+    with TRACER.span("link_output", "stage"):
+        legacy_strategy = link_output(PARTICIPANT_OUTPUT_FILE, LEGACY_OUTPUT_FILE, args.legacy_output)
+    (_, participant_changes), (_, trainer_changes) = results
+    print(f"Created participant deck: {PARTICIPANT_OUTPUT_FILE}{describe_changes(participant_changes)}")
+    print(f"Created trainer deck: {TRAINER_OUTPUT_FILE}{describe_changes(trainer_changes)}")
+    print(f"Updated legacy deck: {LEGACY_OUTPUT_FILE} ({legacy_strategy})")
+    print(f"Created tutorial: {TUTORIAL_OUTPUT_FILE}{describe_changes(None if tutorial_written else [])}")
+    print(f"Assets directory: {ASSETS_DIR}")
+    for preview_file in preview_files:
+        print(f"Preview: {preview_file}")
+    print_text_overflows(decks)
+    if args.media_report:
+        for output_file in (PARTICIPANT_OUTPUT_FILE, TRAINER_OUTPUT_FILE):
+            print_media_report(output_file)
+    report_run(args)
+
+
+def list_contents() -> None:
+    # Reads the raw specs only; nothing here needs Pillow or python-pptx.
+    for name, spec_path in DECK_SPECS.items():
+        slides = read_deck_spec(spec_path)["slides"]
+        print(f"{name} deck ({spec_path.name}, {len(slides)} slides):")
+        for index, slide in enumerate(slides, start=1):
+            images = [element["key"] for element in slide.get("elements", []) if element.get("type") == "image"]
+            suffix = f"  [{', '.join(images)}]" if images else ""
+            print(f"  {index:>2}. {slide['id']}: {slide['title']}{suffix}")
+    print(f"Visuals ({ASSETS_DIR}):")
+    for key, (filename, _) in VISUALS.items():
+        print(f"  {key}: {visual_filename(filename)}")
+
+
+def report_run(args: argparse.Namespace) -> None:
+    if args.font_stats:
+        stats = FONTS.stats()
+        print(f"Font cache: {stats['hits']} hits, {stats['misses']} misses, {stats['cached_fonts']} faces loaded")
+        print(f"Text layout cache: {TEXT_LAYOUT.hits} hits, {TEXT_LAYOUT.misses} misses")
+    if args.trace:
+        TRACER.write(args.trace, args.trace_format)
+        print(f"Trace written: {args.trace}")
+
+
+def run_batch(args: argparse.Namespace) -> None:
+    variants = read_variants(args.variants)
+    results = build_batch(
+        variants,
+        args.variants_output,
+        jobs=args.jobs,
+        use_cache=not args.no_cache,
+        incremental=args.incremental,
+    )
+    for variant, decks in results:
+        for output_file, changed in decks:
+            print(f"Created {variant['team']} deck: {output_file}{describe_changes(changed)}")
+    for variant in variants:
+        outputs = variant_outputs(variant, args.variants_output)
+        print_text_overflows([(load_deck_spec(spec_path), output_file) for spec_path, output_file in outputs], variant_context(variant))
     print(f"Assets directory: {ASSETS_DIR}")
+    if args.media_report:
+        for _, decks in results:
+            for output_file, _ in decks:
+                print_media_report(output_file)
+    report_run(args)
 
 
 if __name__ == "__main__":
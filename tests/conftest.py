@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import create_solution_assessment_ppt as generator  # noqa: E402
+
+OUTPUT_PATHS = (
+    "ROOT",
+    "ASSETS_DIR",
+    "VARIANT_ASSETS_DIR",
+    "LEGACY_OUTPUT_FILE",
+    "PARTICIPANT_OUTPUT_FILE",
+    "TRAINER_OUTPUT_FILE",
+    "TUTORIAL_OUTPUT_FILE",
+    "BATCH_OUTPUT_DIR",
+    "PREVIEW_DIR",
+    "RENDER_CACHE_FILE",
+    "TEXT_LAYOUT_CACHE_FILE",
+)
+
+
+@pytest.fixture
+def output_root(tmp_path, monkeypatch):
+    # Tests never write next to the script; every output path moves under tmp_path.
+    for name in OUTPUT_PATHS:
+        monkeypatch.setattr(generator, name, getattr(generator, name))
+    generator.use_output_root(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def images(tmp_path):
+    from PIL import Image
+
+    paths = {}
+    for key, color in (("red", (200, 40, 40)), ("blue", (40, 40, 200))):
+        paths[key] = tmp_path / f"{key}.png"
+        Image.new("RGB", (64, 36), color).save(paths[key], format="PNG")
+    return paths
+
+
+@pytest.fixture
+def deck_spec():
+    return {
+        "name": "sample",
+        "slides": [
+            {"id": "one", "title": "One", "elements": [{"type": "bullets", "lines": ["First", ["Nested", 1]]}, {"type": "image", "key": "red"}]},
+            {"id": "two", "title": "Two", "elements": [{"type": "code", "lines": ["echo {{build_date}}"]}]},
+            {"id": "three", "title": "Three", "elements": [{"type": "image", "key": "blue"}]},
+            {"id": "four", "title": "Four", "elements": [{"type": "image", "key": "red", "x": 1.0}]},
+        ],
+    }
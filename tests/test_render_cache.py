@@ -0,0 +1,26 @@
+import pytest
+
+import create_solution_assessment_ppt as generator
+
+
+def cache_keys() -> dict:
+    jobs, _ = generator.plan_visual_jobs([{}])
+    return generator.visual_cache_keys(jobs)
+
+
+@pytest.mark.parametrize(
+    "name, value, visual",
+    [("CANVAS_BACKGROUND", (0, 0, 0), "cover"), ("MCP_SERVERS", ("jira", "figma"), "mcp_json_screen")],
+)
+def test_constants_a_visual_reads_are_in_its_key(monkeypatch, name, value, visual):
+    before = cache_keys()
+    monkeypatch.setattr(generator, name, value)
+    after = cache_keys()
+    assert after[visual] != before[visual]
+
+
+def test_unread_constants_leave_keys_alone(monkeypatch):
+    before = cache_keys()
+    monkeypatch.setattr(generator, "MCP_SERVERS", ("jira", "figma"))
+    after = cache_keys()
+    assert after["cover"] == before["cover"]
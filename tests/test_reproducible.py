@@ -0,0 +1,49 @@
+import io
+import time
+import zipfile
+
+import create_solution_assessment_ppt as generator
+
+EPOCH = 1700000000
+
+
+def save_deck(deck_spec, images) -> bytes:
+    prs = generator.new_presentation()
+    generator.compile_deck_spec(deck_spec).build(prs, images)
+    buffer = io.BytesIO()
+    generator.save_presentation(prs, buffer)
+    return buffer.getvalue()
+
+
+def test_reproducible_decks_are_byte_identical(monkeypatch, deck_spec, images):
+    monkeypatch.setattr(generator, "BUILD_EPOCH", EPOCH)
+    first = save_deck(deck_spec, images)
+    time.sleep(1.1)
+    assert save_deck(deck_spec, images) == first
+
+
+def test_reproducible_members_are_sorted_and_dated(monkeypatch, deck_spec, images):
+    monkeypatch.setattr(generator, "BUILD_EPOCH", EPOCH)
+    with zipfile.ZipFile(io.BytesIO(save_deck(deck_spec, images))) as package:
+        names = package.namelist()
+        assert names == ["[Content_Types].xml", *sorted(names[1:])]
+        assert {info.date_time for info in package.infolist()} == {time.gmtime(EPOCH)[:6]}
+        assert b"2023-11-14" in package.read("ppt/slides/slide2.xml")
+
+
+def test_zip_timestamps_never_predate_1980(monkeypatch):
+    monkeypatch.setattr(generator, "BUILD_EPOCH", 0)
+    assert generator.zip_member("a.xml").date_time == time.gmtime(generator.ZIP_EPOCH)[:6]
+
+
+def test_incremental_build_at_a_new_epoch_matches_a_full_build(monkeypatch, output_root, deck_spec, images):
+    deck = generator.compile_deck_spec(deck_spec)
+    patched, full = output_root / "patched.pptx", output_root / "full.pptx"
+    monkeypatch.setattr(generator, "BUILD_EPOCH", EPOCH)
+    generator.build_decks(images, [(deck, patched)], incremental=True)
+    monkeypatch.setattr(generator, "BUILD_EPOCH", 1800000000)
+    generator.build_decks(images, [(deck, patched)], incremental=True)
+    generator.build_decks(images, [(deck, full)])
+    assert patched.read_bytes() == full.read_bytes()
+    with zipfile.ZipFile(patched) as package:
+        assert b"2027-01-15" in package.read("docProps/core.xml")
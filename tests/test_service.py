@@ -0,0 +1,125 @@
+import http.client
+import json
+import socket
+import threading
+
+import pytest
+
+import create_solution_assessment_ppt as generator
+
+
+@pytest.fixture
+def server(output_root):
+    # Every request below fails validation, so the service is never warmed.
+    service = generator.DeckService(concurrency=1, cache_size=2)
+    httpd = generator.make_deck_server("127.0.0.1:0", service)
+    thread = threading.Thread(target=httpd.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield httpd.server_address
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def post(address, body: bytes, headers: dict | None = None) -> tuple:
+    connection = http.client.HTTPConnection(*address, timeout=10)
+    try:
+        connection.request("POST", "/build", body=body, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+@pytest.mark.parametrize(
+    "request_body",
+    [
+        {"team": "Payments", "mcp_servers": 5},
+        {"team": "Payments", "mcp_servers": ["jira", 5]},
+        {"team": "Payments", "video_links": ["ab"]},
+        {"team": "Payments", "video_links": [["Title", 5]]},
+        {"team": "Payments", "video_links": {"Title": "https://example.com"}},
+        {"team": "Payments", "mcp_servers": 0},
+        {"team": "Payments", "video_links": False},
+        {"team": ""},
+        {"video_links": 5},
+        {"mcp_servers": ["jira"]},
+        {"slug": "payments"},
+        {"team": 5},
+        {"team": "Payments", "slug": ["payments"]},
+        {"team": "!!!"},
+        {"deck": "missing"},
+        {"deck": ["participant"]},
+        [1],
+    ],
+)
+def test_invalid_requests_are_rejected(server, request_body):
+    status, payload = post(server, json.dumps(request_body).encode("utf-8"))
+    assert status == 400
+    assert payload["error"]
+
+
+def test_malformed_json_is_rejected(server):
+    status, _ = post(server, b"{not json")
+    assert status == 400
+
+
+@pytest.mark.parametrize("length", ["-5", "abc"])
+def test_bad_content_length_is_rejected(server, length):
+    status, _ = post(server, b"", {"Content-Length": length})
+    assert status == 400
+
+
+def test_oversized_request_is_rejected(server):
+    status, _ = post(server, b"", {"Content-Length": str(generator.SERVE_MAX_REQUEST_BYTES + 1)})
+    assert status == 413
+
+
+def test_build_errors_are_not_sent_to_the_client(server, monkeypatch):
+    def fail(self, request):
+        raise RuntimeError("/srv/secret/path")
+
+    monkeypatch.setattr(generator.DeckService, "build", fail)
+    status, payload = post(server, b"{}")
+    assert status == 500
+    assert "secret" not in payload["error"]
+
+
+def test_unix_server_replaces_only_stale_sockets(tmp_path):
+    service = generator.DeckService(concurrency=1, cache_size=1)
+    stale = tmp_path / "stale.sock"
+    with socket.socket(socket.AF_UNIX) as sock:
+        sock.bind(str(stale))
+    httpd = generator.make_deck_server(f"unix:{stale}", service)
+    httpd.server_close()
+
+    other = tmp_path / "notes.txt"
+    other.write_text("keep me", encoding="utf-8")
+    with pytest.raises(SystemExit):
+        generator.make_deck_server(f"unix:{other}", service)
+    assert other.read_text(encoding="utf-8") == "keep me"
+
+
+@pytest.mark.parametrize(
+    "argv",
+    [
+        ["--serve-concurrency", "0"],
+        ["--serve-concurrency", "-1"],
+        ["--serve-cache", "0"],
+        ["--jobs", "-1"],
+        ["--slide-groups", "-2"],
+    ],
+)
+def test_counts_out_of_range_are_rejected(argv):
+    with pytest.raises(SystemExit):
+        generator.parse_args(argv)
+
+
+def test_variant_parsing():
+    variant = generator.parse_variant(
+        {"team": " Payments ", "mcp_servers": "jira, github", "video_links": "Intro|https://example.com/a; Deep dive|https://example.com/b"},
+        "test",
+    )
+    assert variant["team"] == "Payments"
+    assert variant["slug"] == "payments"
+    assert variant["mcp_servers"] == ["jira", "github"]
+    assert variant["video_links"] == [("Intro", "https://example.com/a"), ("Deep dive", "https://example.com/b")]
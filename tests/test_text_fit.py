@@ -0,0 +1,28 @@
+import create_solution_assessment_ppt as generator
+
+
+def test_line_breaks_count_as_lines():
+    metrics = generator.TextMetrics()
+    assert metrics.line_count("mono", "echo one\necho two", 14, 500) == 2
+    assert metrics.line_count("sans", "Run test command:\vcurl -s", 14, 500) == 2
+    assert metrics.line_count("mono", "a\n\nb", 14, 500) == 3
+
+
+def test_leading_spaces_take_width():
+    metrics = generator.TextMetrics()
+    text = "x" * 40
+    width = metrics.width("mono", text, 14)
+    assert metrics.line_count("mono", text, 14, width) == 1
+    assert metrics.line_count("mono", "  " + text, 14, width) == 2
+
+
+def test_fit_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(generator, "TEXT_METRICS", generator.TextMetrics())
+    for number in range(generator.TEXT_FITS_LIMIT + 10):
+        generator.fit_text_box("code", [f"line {number}"], 5.0, 1.0, (14,))
+    assert len(generator.TEXT_METRICS.fits) == generator.TEXT_FITS_LIMIT
+
+
+def test_shipped_decks_fit():
+    for name, spec_path in generator.DECK_SPECS.items():
+        assert generator.text_overflows(generator.load_deck_spec(spec_path)) == [], name
@@ -0,0 +1,134 @@
+import io
+import os
+import posixpath
+import tracemalloc
+import zipfile
+
+from lxml import etree
+
+import create_solution_assessment_ppt as generator
+
+
+def serial_entries(deck_spec, images) -> dict:
+    prs = generator.new_presentation()
+    generator.compile_deck_spec(deck_spec).build(prs, images)
+    return generator.presentation_entries(prs)
+
+
+def grouped_entries(deck_spec, images, groups: int) -> dict:
+    # The same steps build_decks() takes with --slide-groups, run in-process.
+    prs = generator.new_presentation()
+    for _ in deck_spec["slides"]:
+        prs.slides.add_slide(prs.slide_layouts[6])
+    entries = generator.presentation_entries(prs)
+    patches = []
+    for indices in generator.split_slide_groups(len(deck_spec["slides"]), groups):
+        report = generator.build_slide_group(deck_spec, images, {}, indices)
+        patches.append((report["entries"], {n: index + 1 for n, index in enumerate(indices, start=1)}))
+    generator.merge_slide_patches(entries, patches)
+    return entries
+
+
+def slide_media(entries: dict) -> dict:
+    # Slide number -> SHA1 of each picture it shows, in relationship order.
+    media = {}
+    for name in sorted(entries):
+        if name.startswith("ppt/slides/_rels/"):
+            for rel in etree.fromstring(entries[name]):
+                target = posixpath.normpath(posixpath.join("ppt/slides", rel.get("Target")))
+                if target.startswith("ppt/media/"):
+                    media.setdefault(name, []).append(generator.entry_digest(entries[target]))
+    return media
+
+
+def media_parts(entries: dict) -> list:
+    return [name for name in entries if name.startswith("ppt/media/")]
+
+
+def test_split_slide_groups_are_contiguous():
+    assert generator.split_slide_groups(5, 2) == [[0, 1], [2, 3, 4]]
+    assert generator.split_slide_groups(2, 8) == [[0], [1]]
+
+
+def test_grouped_merge_matches_a_serial_build(deck_spec, images):
+    serial = serial_entries(deck_spec, images)
+    for groups in (2, 3):
+        grouped = grouped_entries(deck_spec, images, groups)
+        for number in range(1, len(deck_spec["slides"]) + 1):
+            name = f"ppt/slides/slide{number}.xml"
+            assert grouped[name] == serial[name]
+        assert slide_media(grouped) == slide_media(serial)
+        # Slides one and four show the same picture and share one part.
+        assert len(media_parts(grouped)) == len(media_parts(serial)) == 2
+
+
+def test_merge_adds_content_types_and_drops_unused_media(deck_spec, images):
+    text_only = {"name": "text", "slides": [dict(slide, elements=[]) for slide in deck_spec["slides"]]}
+    entries = serial_entries(text_only, images)
+    assert not media_parts(entries)
+    assert b'Extension="png"' not in entries["[Content_Types].xml"]
+
+    report = generator.build_slide_group(deck_spec, images, {}, [2])
+    generator.merge_slide_patches(entries, [(report["entries"], {1: 3})])
+    assert media_parts(entries) == ["ppt/media/image1.png"]
+    assert b'Extension="png"' in entries["[Content_Types].xml"]
+
+    # Replacing slide three again with a text slide leaves its picture unreferenced.
+    report = generator.build_slide_group(text_only, images, {}, [2])
+    generator.merge_slide_patches(entries, [(report["entries"], {1: 3})])
+    assert not media_parts(entries)
+
+
+def test_patched_deck_is_a_valid_package(tmp_path, deck_spec, images):
+    output_file = tmp_path / "deck.pptx"
+    assert generator.write_zip_entries(output_file, grouped_entries(deck_spec, images, 2))
+    with zipfile.ZipFile(output_file) as package:
+        assert package.testzip() is None
+    from pptx import Presentation
+
+    assert len(Presentation(str(output_file)).slides) == len(deck_spec["slides"])
+
+
+def test_pictures_share_one_part_and_keep_their_file_name(deck_spec, images):
+    entries = serial_entries(deck_spec, images)
+    media = slide_media(entries)
+    assert media["ppt/slides/_rels/slide1.xml.rels"] == media["ppt/slides/_rels/slide4.xml.rels"]
+    assert b'descr="red.png"' in entries["ppt/slides/slide1.xml"]
+    assert b'descr="blue.png"' in entries["ppt/slides/slide3.xml"]
+
+
+def test_image_parts_do_not_keep_decks_alive(deck_spec, images):
+    import gc
+
+    serial_entries(deck_spec, images)
+    gc.collect()
+    assert not generator.IMAGE_STORE._parts
+
+
+def test_saved_media_are_the_image_files(deck_spec, images):
+    prs = generator.new_presentation()
+    generator.compile_deck_spec(deck_spec).build(prs, images)
+    buffer = io.BytesIO()
+    generator.save_presentation(prs, buffer)
+    with zipfile.ZipFile(buffer) as package:
+        media = sorted(package.read(name) for name in package.namelist() if name.startswith("ppt/media/"))
+    assert media == sorted(path.read_bytes() for path in images.values())
+
+
+def test_saving_does_not_hold_the_images(tmp_path, deck_spec):
+    from PIL import Image
+
+    # Noise does not compress, so each file is about 3 MB.
+    images = {}
+    for key in ("red", "blue"):
+        images[key] = tmp_path / f"{key}.png"
+        Image.frombytes("RGB", (1000, 1000), os.urandom(3_000_000)).save(images[key], format="PNG")
+    prs = generator.new_presentation()
+    generator.compile_deck_spec(deck_spec).build(prs, images)
+    tracemalloc.start()
+    try:
+        generator.save_presentation(prs, tmp_path / "deck.pptx")
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < min(path.stat().st_size for path in images.values())